@@ -6,12 +6,25 @@ from langchain.agents import create_agent
 
 from logger import setup_logger
 from llm.language_models import LanguageModelManager
+from llm.openai_provider import get_shared_http_async_client
 from config import WORKING_DIRECTORY
 logger = setup_logger()
 
 class BaseAgent(ABC):
     """An abstract base class for all agents."""
 
+    # Allow the model to request several independent tool calls in one turn;
+    # the agent's tool node then executes them concurrently.
+    parallel_tool_calls: bool = False
+
+    # Optional agent state schema, for tools that read extra keys through
+    # InjectedState. Defaults to the plain message-only agent state.
+    state_schema: Any = None
+
+    # Checkpointer for the agent's own run. None inherits the parent graph's
+    # checkpointer when invoked from a workflow node; False disables it.
+    checkpointer: Any = None
+
     def __init__(
         self,
         agent_name: str,
@@ -36,10 +49,18 @@ class BaseAgent(ABC):
         self.working_directory = working_directory
         self.response_format = response_format
 
+        self._build()
+
+    def _build(self) -> None:
+        """Create the model and agent executor on the current shared HTTP client."""
         # Create the language model using the manager
+        model_kwargs = {"parallel_tool_calls": True} if self.parallel_tool_calls else {}
+        self._http_client = get_shared_http_async_client()
         self.model = ChatOpenAI(
             model="gpt-5-mini",
             temperature=0.7,
+            model_kwargs=model_kwargs,
+            http_async_client=self._http_client,
         )
 
         # Get agent-specific configuration from subclasses
@@ -51,9 +72,15 @@ class BaseAgent(ABC):
             self.model,
             tools,
             role_prompt,
-            team_members,
-            response_format,
+            self.team_members,
+            self.response_format,
         )
+
+    def _ensure_current_client(self) -> None:
+        """Rebuild if the shared HTTP client was closed and replaced since creation."""
+        if self._http_client is not get_shared_http_async_client():
+            self._build()
+
     def _create_base_agent(
         self,
         model,
@@ -98,11 +125,15 @@ class BaseAgent(ABC):
                 )
 
             # Create agent
+            agent_kwargs = {"state_schema": self.state_schema} if self.state_schema else {}
+            if self.checkpointer is not None:
+                agent_kwargs["checkpointer"] = self.checkpointer
             agent = create_agent(
                 model=model,
                 tools=tools,
                 system_prompt=system_prompt,
-                response_format=response_format
+                response_format=response_format,
+                **agent_kwargs,
             )
 
             logger.info(f"{self.agent_name} created successfully")
@@ -125,8 +156,22 @@ class BaseAgent(ABC):
         Returns:
             The agent's response (type may vary).
         """
+        self._ensure_current_client()
         return self.agent.invoke(state)
 
+    async def ainvoke(self, state: Any) -> Any:
+        """
+        Asynchronously invokes the agent with a given state.
+
+        Args:
+            state: The current state of the workflow, accepts any input understood by the underlying agent.
+
+        Returns:
+            The agent's response (type may vary).
+        """
+        self._ensure_current_client()
+        return await self.agent.ainvoke(state)
+
     @abstractmethod
     def _get_system_prompt(self) -> str:
         """
@@ -1,4 +1,8 @@
-from typing import Literal
+import os
+import functools
+import hashlib
+import pickle
+from typing import Any, Literal
 from pydantic import BaseModel, Field
 from langchain_core.messages import AIMessage
 from langgraph.types import Command
@@ -6,17 +10,57 @@ from langchain_openai import ChatOpenAI
 import pandas as pd
 from core.state import GraphState
 
+try:
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover - pandas fallback
+    _HAS_PYARROW = False
+
+INTERACTIONS_CSV = os.getenv(
+    "INTERACTIONS_CSV",
+    os.path.join(os.path.dirname(__file__), '..', 'data', 'interactions.csv'),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_interactions(path: str, mtime_ns: int) -> list:
+    """Read the interactions CSV into records; cached per file version via `mtime_ns`."""
+    if _HAS_PYARROW:
+        table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(block_size=1 << 20))
+        return table.to_pylist()
+    return pd.read_csv(path).to_dict(orient="records")
+
+
+def interactions_key(interactions: Any) -> str:
+    """Content hash of interaction records, used to tell whether SNA results are stale."""
+    return hashlib.blake2b(pickle.dumps(interactions), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=4)
+def _read_interactions_key(path: str, mtime_ns: int) -> str:
+    """`interactions_key` of the records for one file version, hashed once."""
+    return interactions_key(_read_interactions(path, mtime_ns))
+
+
+def load_interactions(path: str = INTERACTIONS_CSV) -> list:
+    """Return the interaction records, re-reading the file only when it changes."""
+    return _read_interactions(path, os.stat(path).st_mtime_ns)
+
+
 def data_loader_node(state: GraphState) -> Command:
     """
     Data loader node for initializing or updating the cow interaction data
     and social network graph in the CowNet multi-agent system.
     """
-    interactions_df = pd.read_csv("D:\\DrSuresh_Co-op\\CowNet_AI_Repo\\COWNET-AI-MultiAgent\\src\\data\\interactions.csv")
-    interactions_dict = interactions_df.to_dict(orient="records")
+    path = INTERACTIONS_CSV
+    mtime_ns = os.stat(path).st_mtime_ns
+    interactions_dict = _read_interactions(path, mtime_ns)
     
     return Command(
         update={
             "interactions": interactions_dict,
+            # Hashed here once per file version, so later hops compare keys
+            "interactions_key": _read_interactions_key(path, mtime_ns),
             "messages": [AIMessage(content="Loaded interaction data")]
         },
         goto="supervisor"
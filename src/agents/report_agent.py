@@ -8,7 +8,7 @@ from llm.language_models import LanguageModelManager
 from config import WORKING_DIRECTORY
 from core.state import GraphState
 
-from ..tools.report_tools import markdown_to_pdf
+from ..tools.report_tools import markdown_to_pdf, markdown_to_pdf_async
 
 
 class ReportAgent(BaseAgent):
@@ -27,6 +27,8 @@ class ReportAgent(BaseAgent):
 		team_members: List[str],
 		working_directory: str = WORKING_DIRECTORY,
 	):
+		# BaseAgent reads the prompt during construction, so build it first
+		self._system_prompt = self._build_system_prompt_text()
 		super().__init__(
 			agent_name="report_agent",
 			language_model_manager=language_model_manager,
@@ -36,6 +38,9 @@ class ReportAgent(BaseAgent):
 		)
 
 	def _get_system_prompt(self) -> str:
+		return self._system_prompt
+
+	def _build_system_prompt_text(self) -> str:
 		return (
 			"SYSTEM_PROMPT:"
 			"You are the Report Agent."
@@ -70,53 +75,62 @@ report_agent = ReportAgent(
 )
 
 
+_FALLBACK_REPORT_TEMPLATE = """# CowNet Herd Health Briefing
+## Executive Summary
+Your herd shows stable connectivity with identified risk signals.
+
+## Key Network Insights
+- Herd size: {herd_size}
+- Network density: {density}
+- Average degree: {avg_degree}
+
+## High Risk Cows
+{risk_block}
+
+## Actionable Recommendations
+1. Monitor high-risk cows and adjust grouping to reduce conflicts.
+2. Reinforce social reintegration for isolated cows.
+
+## Additional Notes{notes_block}"""
+
+
 def _compose_markdown_from_state(state: GraphState) -> str:
 	"""Compose a minimal markdown report from the state as fallback.
 
 	Used if the LLM does not produce the markdown automatically. Ensures the
 	tool can still run and produce a reasonable PDF.
 	"""
-	lines: List[str] = []
-	lines.append("# CowNet Herd Health Briefing")
-	lines.append("## Executive Summary")
-	lines.append("Your herd shows stable connectivity with identified risk signals.")
-	lines.append("")
-	lines.append("## Key Network Insights")
 	sna = state.get("sna_metrics") or {}
 	herd = sna.get("herd_metrics", {})
-	lines.append(f"- Herd size: {herd.get('num_cows', 'N/A')}")
-	lines.append(f"- Network density: {herd.get('density', 'N/A')}")
-	lines.append(f"- Average degree: {herd.get('avg_degree', 'N/A')}")
-	lines.append("")
-	lines.append("## High Risk Cows")
+
 	top = sna.get("top_risk_cows", [])
 	if isinstance(top, list) and top:
-		for entry in top:
-			cid = entry.get("cow_id", "unknown")
-			cr = entry.get("conflict_risk", 0)
-			ir = entry.get("isolation_risk", 0)
-			lines.append(f"- {cid}: conflict={cr:.2f}, isolation={ir:.2f}")
+		risk_block = "\n".join(
+			f"- {entry.get('cow_id', 'unknown')}: "
+			f"conflict={entry.get('conflict_risk', 0):.2f}, "
+			f"isolation={entry.get('isolation_risk', 0):.2f}"
+			for entry in top
+		)
 	else:
-		lines.append("- No high-risk cows identified.")
-	lines.append("")
-	lines.append("## Actionable Recommendations")
-	lines.append("1. Monitor high-risk cows and adjust grouping to reduce conflicts.")
-	lines.append("2. Reinforce social reintegration for isolated cows.")
-	lines.append("")
-	lines.append("## Additional Notes")
+		risk_block = "- No high-risk cows identified."
+
+	notes_block = ""
 	research = state.get("research")
 	if research:
-		lines.append("Research findings:")
-		lines.append(research)
-	sim = state.get("simulation_metrics")
-	if sim:
-		lines.append("Simulation summary:")
-		lines.append("- Simulation results available.")
+		notes_block += f"\nResearch findings:\n{research}"
+	if state.get("simulation_metrics"):
+		notes_block += "\nSimulation summary:\n- Simulation results available."
 
-	return "\n".join(lines)
+	return _FALLBACK_REPORT_TEMPLATE.format(
+		herd_size=herd.get("num_cows", "N/A"),
+		density=herd.get("density", "N/A"),
+		avg_degree=herd.get("avg_degree", "N/A"),
+		risk_block=risk_block,
+		notes_block=notes_block,
+	)
 
 
-def report_agent_node(state: GraphState) -> Command:
+async def report_agent_node(state: GraphState) -> Command:
 	"""Node that drives the report agent to produce a PDF and end the workflow.
 
 	Preconditions:
@@ -139,33 +153,36 @@ def report_agent_node(state: GraphState) -> Command:
 		)
 
 	# Let the LLM agent run; it should call markdown_to_pdf.
-	response = report_agent.invoke(state)
+	response = await report_agent.ainvoke(state)
 
 	# Extract ToolMessage produced by `markdown_to_pdf` if present.
 	pdf_summary = "Report generated."
 	pdf_path = None
 
-	for msg in response.get("messages", []):
-		if isinstance(msg, ToolMessage):
-			artifact = getattr(msg, "artifact", None) or {}
-			if "path" in artifact:
-				pdf_path = artifact.get("path")
-				pdf_summary = f"✅ Report generated: {artifact.get('filename')}\n📁 Saved: {pdf_path}"
-				break
+	# The tool call is normally at the end, so scan newest-first and stop early.
+	tool_artifacts = (
+		getattr(msg, "artifact", None) or {}
+		for msg in reversed(response.get("messages", ()))
+		if isinstance(msg, ToolMessage)
+	)
+	artifact = next((a for a in tool_artifacts if "path" in a), None)
+	if artifact is not None:
+		pdf_path = artifact.get("path")
+		pdf_summary = f"✅ Report generated: {artifact.get('filename')}\n📁 Saved: {pdf_path}"
 
 	# Fallback: if tool wasn't called, compose markdown and call tool directly.
 	if pdf_path is None:
 		fallback_md = _compose_markdown_from_state(state)
-		content, artifact = markdown_to_pdf.invoke({
-			"markdown": fallback_md,
-			"filename": "cownet_briefing.pdf",
-			"title": "CowNet Report",
-		})
+		# The tool's coroutine renders on the shared bounded PDF executor
+		content, artifact = await markdown_to_pdf_async(
+			fallback_md, filename="cownet_briefing.pdf", title="CowNet Report"
+		)
 		pdf_path = artifact.get("path")
 		pdf_summary = content if content else pdf_summary
 
 	updates = {
 		"messages": [AIMessage(content=pdf_summary, name="report_agent")],
+		"final_response": pdf_summary,
 	}
 
 	return Command(update=updates, goto="supervisor")
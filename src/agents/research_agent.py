@@ -1,11 +1,12 @@
-from typing import List
+import asyncio
+import json
+import re
+import threading
+from typing import List, Optional
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from langchain_core.messages import AIMessage, HumanMessage, BaseMessage
 from langgraph.types import Command
-from semanticscholar import SemanticScholar
-from langchain_community.tools.semanticscholar.tool import SemanticScholarQueryRun
-from langchain_community.utilities.semanticscholar import SemanticScholarAPIWrapper
-from langchain_community.agent_toolkits.load_tools import load_tools
-from ..llm.language_models import LanguageModelManager
+from llm.language_models import LanguageModelManager
 from ..agents.base_agent import BaseAgent
 from config import WORKING_DIRECTORY
 from core.state import GraphState
@@ -124,10 +125,35 @@ INTENTS = {
   ]
 }
 
+# Compact serialization of INTENTS, computed once for prompt interpolation
+_INTENTS_JSON = json.dumps(INTENTS, separators=(",", ":"))
+
+# Words in intent names too generic to identify an intent on their own
+_INTENT_STOPWORDS = frozenset({"top", "5", "cows", "from", "last", "week", "and", "between", "new", "high", "risk"})
+
+# Keywords per intent id, derived from the intent names
+_INTENT_KEYWORDS = {
+    rule["id"]: frozenset(rule["intent"].split("_")) - _INTENT_STOPWORDS
+    for rule in INTENTS["rules"]
+}
+
+
+class IntentFinding(BaseModel):
+    """Research findings for a single intent in a batched request."""
+    id: int = Field(description="Id of the intent these findings answer")
+    findings: str = Field(description="Evidence-based findings for the intent")
+    citations: List[str] = Field(default_factory=list, description="Compact citations supporting the findings")
+
+
+_INTENT_FINDINGS_ADAPTER = TypeAdapter(List[IntentFinding])
+
 
 class ResearchAgent(BaseAgent):
     """Agent responsible for gathering and summarizing research information."""
 
+    # Semantic Scholar, arXiv and PubMed lookups are independent network calls
+    parallel_tool_calls = True
+
     def __init__(self, language_model_manager: LanguageModelManager, team_members: List[str], working_directory: str = WORKING_DIRECTORY):
         """
         Initialize the SearchAgent.
@@ -137,6 +163,9 @@ class ResearchAgent(BaseAgent):
             team_members: List of team member roles for collaboration.
             working_directory: The directory where the agent's data will be stored.
         """
+        self._tools: Optional[List] = None
+        # BaseAgent reads the prompt during construction, so build it first
+        self._system_prompt = self._build_system_prompt_text()
         super().__init__(
             agent_name="research_agent",
             language_model_manager=language_model_manager,
@@ -146,13 +175,17 @@ class ResearchAgent(BaseAgent):
 
     def _get_system_prompt(self) -> str:
         """Get the system prompt for information retrieval and summarization."""
+        return self._system_prompt
+
+    def _build_system_prompt_text(self) -> str:
+        """Compose the system prompt text for information retrieval and summarization."""
         return f'''
 SYSTEM PROMPT:
 You are the Research Agent. Act autonomously and do not ask for clarifications.
 Objective: Produce evidence-based synthesis into state["research"] supporting CowNet decisions.
 
 Capabilities:
-- FIXED INTENTS: {INTENTS} — use as foundational, structured domain rules.
+- FIXED INTENTS: {_INTENTS_JSON} — use as foundational, structured domain rules.
 - TOOLS: SemanticScholar, PubMed, arXiv — fetch peer-reviewed or respected sources.
 
 Protocol:
@@ -175,27 +208,116 @@ CONSTRAINTS:
 
     def _get_tools(self):
         """Get the list of tools for information retrieval and summarization."""
-        return [SemanticScholarQueryRun(api_wrapper=SemanticScholarAPIWrapper())] + load_tools(["arxiv"]) + load_tools(["pubmed"])
-      
-research_agent = ResearchAgent(
-    language_model_manager=LanguageModelManager(),
-    team_members=["supervisor", "sna_agent", "simulation_agent", "response_agent"]
-)
-
-def research_node(state: GraphState) -> Command:
+        # Tool dependencies are heavy, so import and build them on first use only
+        if self._tools is None:
+            from langchain_community.tools.semanticscholar.tool import SemanticScholarQueryRun
+            from langchain_community.utilities.semanticscholar import SemanticScholarAPIWrapper
+            from langchain_community.agent_toolkits.load_tools import load_tools
+
+            self._tools = [SemanticScholarQueryRun(api_wrapper=SemanticScholarAPIWrapper())] + load_tools(["arxiv"]) + load_tools(["pubmed"])
+        return self._tools
+
+
+# Shared agent instance, created on first use so importing this module stays cheap
+_research_agent: Optional[ResearchAgent] = None
+_research_agent_lock = threading.Lock()
+
+
+def get_research_agent() -> ResearchAgent:
+    """Get or create the shared research agent; concurrent first calls build it once."""
+    global _research_agent
+    if _research_agent is None:
+        with _research_agent_lock:
+            if _research_agent is None:
+                _research_agent = ResearchAgent(
+                    language_model_manager=LanguageModelManager(),
+                    team_members=["supervisor", "sna_agent", "simulation_agent", "response_agent"]
+                )
+    return _research_agent
+
+
+async def aget_research_agent() -> ResearchAgent:
+    """`get_research_agent` for the event loop; the first build runs on a worker thread."""
+    if _research_agent is not None:
+        return _research_agent
+    # Building imports the heavy tool packages and creates the agent graph
+    return await asyncio.to_thread(get_research_agent)
+
+
+def _match_intents(query: str) -> List[dict]:
+    """Return the fixed intents whose keywords appear in the query."""
+    words = set(re.findall(r"[a-z]+", query.lower()))
+    return [rule for rule in INTENTS["rules"] if _INTENT_KEYWORDS[rule["id"]] & words]
+
+
+def _build_intent_batch_message(rules: List[dict]) -> HumanMessage:
+    """Build one request covering every matched intent, answered by id."""
+    lines = [
+        "For each of the following intents, produce evidence-based findings and citations.",
+        'Return ONLY a JSON list of objects {"id": <intent id>, "findings": <text>, "citations": [<citation>, ...]}, one per intent, indexed by id.',
+    ]
+    lines.extend(
+        f"{i}. {json.dumps(rule, separators=(',', ':'))}"
+        for i, rule in enumerate(rules, 1)
+    )
+    return HumanMessage(content="\n".join(lines))
+
+
+def _format_intent_findings(output: str, rules: List[dict]) -> str:
+    """Map batched JSON findings back onto their intents as plain text.
+
+    Falls back to the raw output if the model did not return valid JSON.
+    """
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", output.strip())
+    try:
+        findings = _INTENT_FINDINGS_ADAPTER.validate_json(text)
+    except ValidationError:
+        return output
+
+    by_id = {finding.id: finding for finding in findings}
+    sections = []
+    for rule in rules:
+        finding = by_id.get(rule["id"])
+        if finding is None:
+            continue
+        section = f"[{rule['intent']}]\n{finding.findings}"
+        if finding.citations:
+            section += "\nCitations:\n" + "\n".join(f"- {c}" for c in finding.citations)
+        sections.append(section)
+
+    return "\n\n".join(sections) or output
+
+
+async def research_node(state: GraphState) -> Command:
     """Extract research information from the GraphState.
 
+    When the user query matches fixed intents, all of them are researched in a
+    single batched request instead of one agent turn per intent. The agent runs
+    asynchronously so parallel tool calls to the literature services are
+    gathered concurrently rather than executed one after another.
+
     Args:
         state: The current GraphState containing research data.
     """
-    
-    response = research_agent.invoke(state)
+    messages = list(state.get("messages", []))
+    # user_query is this turn's question; the first HumanMessage in the
+    # checkpointed history belongs to the thread's first turn
+    matched_intents = _match_intents(state.get("user_query") or "")
+
+    research_agent = await aget_research_agent()
+    if matched_intents:
+        batch_state = {**state, "messages": messages + [_build_intent_batch_message(matched_intents)]}
+        response = await research_agent.ainvoke(batch_state)
+    else:
+        response = await research_agent.ainvoke(state)
     
     message = response.get("messages")[-1]
     output = message.content
+    if matched_intents:
+        output = _format_intent_findings(output, matched_intents)
     
     updates = {
-        "messages": [AIMessage(content=output)],
+        "messages": [AIMessage(content=output, name="research_agent")],
         "research": output
     }
     
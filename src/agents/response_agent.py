@@ -1,33 +1,97 @@
+import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence, Dict, Any, Optional
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+import httpx
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
 from langgraph.types import Command
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END
+from langgraph.config import get_stream_writer
 from mem0 import Memory
+from diskcache import Cache
 
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from core.state import GraphState
+from llm.openai_provider import get_shared_http_async_client
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+def _build_mem0_config(collection_name: str) -> Dict[str, Any]:
+    """Build a mem0 configuration backed by pgvector for the given collection."""
+    # pgvector configuration from environment variables
+    pg_host = os.getenv("PGVECTOR_HOST", "localhost")
+    pg_port = os.getenv("PGVECTOR_PORT", "5432")
+    pg_user = os.getenv("PGVECTOR_USER", "postgres")
+    pg_password = os.getenv("PGVECTOR_PASSWORD", "postgres")
+    pg_database = os.getenv("PGVECTOR_DATABASE", "cownet_memory")
+    pool_min = int(os.getenv("PGVECTOR_POOL_MIN", "2"))
+    pool_max = int(os.getenv("PGVECTOR_POOL_MAX", "16"))
+    
+    return {
+        "vector_store": {
+            "provider": "pgvector",
+            "config": {
+                "host": pg_host,
+                "port": int(pg_port),
+                "user": pg_user,
+                "password": pg_password,
+                "dbname": pg_database,
+                "embedding_model_dims": 1536,
+                "collection_name": collection_name,
+                # Pooled connections so concurrent search/add calls don't queue
+                "minconn": pool_min,
+                "maxconn": pool_max,
+                # HNSW index keeps similarity search sublinear as memories grow
+                "hnsw": True,
+            }
+        },
+        "embedder": {
+            "provider": "openai",
+            "config": {
+                "model": "text-embedding-3-small",
+                "embedding_dims": 1536,
+            }
+        },
+        "llm": {
+            "provider": "openai",
+            "config": {
+                "model": "gpt-4o-mini",
+                "temperature": 0,
+            }
+        },
+        "version": "v1.1"
+    }
+
+
 class CowNetMemory:
     """
     Long-term memory layer for CowNet using mem0 with pgvector database.
     Provides persistent memory storage and retrieval for contextual responses.
     """
     
+    # Fixed attribute layout; is_available is read on every response turn
+    __slots__ = ("_memory", "is_available")
+    
     _instance: Optional["CowNetMemory"] = None
-    _memory: Optional[Memory] = None
     
     def __new__(cls):
         """Singleton pattern to ensure single memory instance."""
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            instance = super().__new__(cls)
+            instance._memory = None
+            instance.is_available = False
+            cls._instance = instance
         return cls._instance
     
     def __init__(self):
@@ -35,42 +99,7 @@ class CowNetMemory:
         if self._memory is not None:
             return
             
-        # pgvector configuration from environment variables
-        pg_host = os.getenv("PGVECTOR_HOST", "localhost")
-        pg_port = os.getenv("PGVECTOR_PORT", "5432")
-        pg_user = os.getenv("PGVECTOR_USER", "postgres")
-        pg_password = os.getenv("PGVECTOR_PASSWORD", "postgres")
-        pg_database = os.getenv("PGVECTOR_DATABASE", "cownet_memory")
-        
-        config = {
-            "vector_store": {
-                "provider": "pgvector",
-                "config": {
-                    "host": pg_host,
-                    "port": int(pg_port),
-                    "user": pg_user,
-                    "password": pg_password,
-                    "dbname": pg_database,
-                    "embedding_model_dims": 1536,
-                    "collection_name": "cownet_memories",
-                }
-            },
-            "embedder": {
-                "provider": "openai",
-                "config": {
-                    "model": "text-embedding-3-small",
-                    "embedding_dims": 1536,
-                }
-            },
-            "llm": {
-                "provider": "openai",
-                "config": {
-                    "model": "gpt-4o-mini",
-                    "temperature": 0,
-                }
-            },
-            "version": "v1.1"
-        }
+        config = _build_mem0_config(collection_name="cownet_memories")
         
         try:
             self._memory = Memory.from_config(config)
@@ -78,11 +107,23 @@ class CowNetMemory:
         except Exception as e:
             logger.error(f"Failed to initialize mem0 memory: {e}")
             self._memory = None
+        
+        # Cached availability flag instead of a property call per turn
+        self.is_available = self._memory is not None
     
-    @property
-    def is_available(self) -> bool:
-        """Check if memory is available."""
-        return self._memory is not None
+    def close(self) -> None:
+        """Release the pooled database connections held by the vector store."""
+        if not self.is_available:
+            return
+        
+        vector_store = getattr(self._memory, "vector_store", None)
+        close = getattr(vector_store, "close", None)
+        try:
+            if close is not None:
+                close()
+                logger.info("Closed CowNet long-term memory connections")
+        except Exception as e:
+            logger.error(f"Failed to close memory connections: {e}")
     
     def search(self, query: str, user_id: str = "cownet_user", limit: int = 5) -> list[Dict[str, Any]]:
         """
@@ -157,14 +198,172 @@ class CowNetMemory:
             return []
 
 
+# Anchored to the source tree so the cache does not depend on the process CWD
+LLM_RESPONSE_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'llm_responses')
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache of LLM responses keyed by a hash of the full prompt.
+    Identical prompts with identical state short-circuit the LLM call.
+    """
+    
+    def __init__(self, directory: str = LLM_RESPONSE_CACHE_DIR, expire: int = 3600):
+        """
+        Initialize the on-disk cache.
+        
+        Args:
+            directory: Directory backing the cache
+            expire: Time-to-live of cached responses in seconds
+        """
+        self.expire = expire
+        try:
+            self._cache: Optional[Cache] = Cache(directory)
+        except Exception as e:
+            logger.error(f"Failed to initialize LLM response cache: {e}")
+            self._cache = None
+    
+    @property
+    def is_available(self) -> bool:
+        """Check if the cache is available."""
+        return self._cache is not None
+    
+    @staticmethod
+    def make_key(messages: Sequence[BaseMessage], *extra: str) -> str:
+        """Build a cache key from the prompt messages and any extra context strings."""
+        payload = json.dumps([(m.type, m.content) for m in messages] + list(extra))
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response content for a key, or None on a miss."""
+        if not self.is_available:
+            return None
+        try:
+            return self._cache.get(key)
+        except Exception as e:
+            logger.error(f"LLM response cache lookup failed: {e}")
+            return None
+    
+    def set(self, key: str, content: str) -> None:
+        """Store response content under a key."""
+        if not self.is_available:
+            return
+        try:
+            self._cache.set(key, content, expire=self.expire)
+        except Exception as e:
+            logger.error(f"Failed to cache LLM response: {e}")
+
+
 def _get_user_query(messages: Sequence[BaseMessage]) -> str:
-    """Extract the original user query from messages."""
+    """Extract the original user query from messages.
+
+    Fallback for states without a recorded `user_query`.
+    """
     for msg in messages:
         if isinstance(msg, HumanMessage):
             return msg.content
     return ""
 
 
+# Upstream agents whose latest output is kept in the response prompt
+_UPSTREAM_AGENT_NAMES = frozenset({"sna_agent", "research_agent", "simulation_agent", "report_agent"})
+
+# Agents whose messages answer the user; kept for earlier turns of the thread
+_ANSWER_AGENT_NAMES = frozenset({"response_agent", "report_agent"})
+
+# Number of earlier question/answer turns kept for follow-up questions
+_HISTORY_TURNS = 3
+
+
+# Context summaries for every combination of available upstream outputs,
+# indexed by the bitmask (sna << 2) | (simulation << 1) | research
+_SNA_CONTEXT = "SNA METRICS available: per-cow risk scores, centrality, herd summaries"
+_SIMULATION_CONTEXT = "SIMULATION RESULTS available: network changes after cow removal"
+_RESEARCH_CONTEXT = "RESEARCH FINDINGS available: rule-based insights + academic references"
+_NO_CONTEXT = "No metrics/research available - use conversation history only"
+
+_CTX_TABLE: tuple[str, ...] = tuple(
+    " | ".join(
+        part
+        for bit, part in ((4, _SNA_CONTEXT), (2, _SIMULATION_CONTEXT), (1, _RESEARCH_CONTEXT))
+        if mask & bit
+    ) or _NO_CONTEXT
+    for mask in range(8)
+)
+
+
+# Queries too trivial to be worth embedding for long-term memory
+_TRIVIAL_QUERIES = frozenset({"hi", "hello", "thanks", "ok", "cancel"})
+
+
+def _is_memory_worthy(query: str) -> bool:
+    """Check whether a query carries enough content to search or store in memory."""
+    return len(query.split()) >= 4 and query.strip().lower() not in _TRIVIAL_QUERIES
+
+
+def _compact_messages(messages: Sequence[BaseMessage]) -> list[BaseMessage]:
+    """
+    Reduce conversation history to what the response agent needs.
+
+    Keeps the last `_HISTORY_TURNS` earlier exchanges (user message and the
+    answer given to it), then the current user message with the latest
+    message from each upstream agent and any tool message carrying a
+    generated PDF produced since that message. Everything else (supervisor
+    routing notes, tool-call scaffolding, older turns and upstream output
+    from earlier questions) is dropped so prompt size stays bounded as the
+    conversation grows.
+    """
+    turn_start = next(
+        (i for i in range(len(messages) - 1, -1, -1) if isinstance(messages[i], HumanMessage)),
+        0,
+    )
+
+    # Current turn, newest first: one message per upstream agent, plus PDFs
+    current: list[BaseMessage] = []
+    seen_agents: set[str] = set()
+    for msg in reversed(messages[turn_start + 1:]):
+        if isinstance(msg, ToolMessage):
+            artifact = getattr(msg, "artifact", None) or {}
+            if isinstance(artifact, dict) and "path" in artifact:
+                current.append(msg)
+        elif isinstance(msg, AIMessage):
+            if msg.name in _UPSTREAM_AGENT_NAMES and msg.name not in seen_agents:
+                seen_agents.add(msg.name)
+                current.append(msg)
+    current.reverse()
+
+    # Earlier turns: only the user's messages and the answers they got
+    history = [
+        msg for msg in messages[:turn_start]
+        if isinstance(msg, HumanMessage)
+        or (isinstance(msg, AIMessage) and msg.name in _ANSWER_AGENT_NAMES)
+    ]
+    user_indices = [i for i, msg in enumerate(history) if isinstance(msg, HumanMessage)]
+    if len(user_indices) > _HISTORY_TURNS:
+        history = history[user_indices[-_HISTORY_TURNS]:]
+
+    head = [messages[turn_start]] if messages and isinstance(messages[turn_start], HumanMessage) else []
+    return history + head + current
+
+
+def _final_answer(content: str, **updates: Any) -> Command:
+    """Build the terminal Command carrying the response agent's answer and any extra state updates."""
+    return Command(
+        update={
+            # Only the new message; the add_messages reducer appends it
+            "messages": [
+                AIMessage(
+                    content=content,
+                    name="response_agent",
+                )
+            ],
+            "final_response": content,
+            **updates,
+        },
+        goto=END,
+    )
+
+
 def _format_memory_context(memories: list[Dict[str, Any]]) -> str:
     """Format retrieved memories into context string for the prompt."""
     if not memories:
@@ -184,9 +383,93 @@ def _format_memory_context(memories: list[Dict[str, Any]]) -> str:
 
 # Initialize singleton memory instance
 _cownet_memory = CowNetMemory()
+atexit.register(_cownet_memory.close)
+
+def _get_llm() -> ChatOpenAI:
+    """
+    Get the shared response LLM client.
+
+    Built on first use so environment variables are loaded by then, and
+    reused afterwards to keep the HTTP connection pool warm.
+    """
+    return _build_llm(get_shared_http_async_client())
+
+
+@functools.lru_cache(maxsize=1)
+def _build_llm(http_client: httpx.AsyncClient) -> ChatOpenAI:
+    """Response LLM bound to the given client, rebuilt once it is replaced."""
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        http_async_client=http_client,
+    )
+
+
+# Minimum interval between streamed token batches, to avoid per-token framing
+_STREAM_FLUSH_INTERVAL = 0.05
+
+
+async def _stream_llm_response(llm: ChatOpenAI, messages: list[BaseMessage]) -> str:
+    """
+    Stream the LLM answer to LangGraph's custom stream channel.
+
+    Tokens are forwarded in batches roughly every 50 ms; the full text is
+    accumulated and returned for storage in state.
+    """
+    writer = get_stream_writer()
+    parts: list[str] = []
+    pending: list[str] = []
+    last_flush = time.monotonic()
+
+    async for chunk in llm.astream(messages):
+        if not chunk.content:
+            continue
+        parts.append(chunk.content)
+        pending.append(chunk.content)
+        now = time.monotonic()
+        if now - last_flush >= _STREAM_FLUSH_INTERVAL:
+            writer({"agent": "response_agent", "token": "".join(pending)})
+            pending.clear()
+            last_flush = now
+
+    if pending:
+        writer({"agent": "response_agent", "token": "".join(pending)})
+
+    return "".join(parts)
+
 
+# Exact-match cache for deterministic (temperature 0) responses
+_llm_response_cache = LLMResponseCache()
 
-def response_agent_node(state: GraphState) -> Command:
+# Background executor for long-term memory writes so the embedding call and
+# pgvector insert stay off the response path
+_MEMORY_WRITE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cownet-memory")
+_MAX_PENDING_MEMORY_WRITES = 64
+_pending_memory_writes = threading.BoundedSemaphore(_MAX_PENDING_MEMORY_WRITES)
+
+# Flush queued writes on interpreter shutdown
+atexit.register(_MEMORY_WRITE_POOL.shutdown, wait=True)
+
+
+def _submit_memory_write(func, *args) -> bool:
+    """
+    Queue a memory or cache write on the background executor.
+
+    Returns:
+        True if the write was queued, False if the backlog is full and it was dropped
+    """
+    if not _pending_memory_writes.acquire(blocking=False):
+        logger.warning(
+            f"Memory write backlog full ({_MAX_PENDING_MEMORY_WRITES} pending), dropping write"
+        )
+        return False
+
+    future = _MEMORY_WRITE_POOL.submit(func, *args)
+    future.add_done_callback(lambda _: _pending_memory_writes.release())
+    return True
+
+
+async def response_agent_node(state: GraphState) -> Command:
     """
     Response agent node with long-term memory integration.
 
@@ -194,46 +477,45 @@ def response_agent_node(state: GraphState) -> Command:
     using all available data from other agents, adapting format to query type.
     Leverages mem0 long-term memory with pgvector for contextual awareness.
     """
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0,
-    )
+    llm = _get_llm()
 
     # Unpack state
     messages: Sequence[BaseMessage] = state.get("messages", [])
     sna_metrics: Dict[str, Any] | None = state.get("sna_metrics")
-    simulation_graph: Dict[str, Any] | None = state.get("simulation_graph")
     simulation_metrics: Dict[str, Any] | None = state.get("simulation_metrics")
     research_text: str | None = state.get("research")
 
     # Extract user query for memory operations
-    user_query = _get_user_query(messages)
-    
-    # Search long-term memory for relevant context
-    memory_context = ""
-    if user_query and _cownet_memory.is_available:
-        retrieved_memories = _cownet_memory.search(
-            query=user_query,
-            user_id="cownet_user",
-            limit=5
+    user_query = state.get("user_query") or _get_user_query(messages)
+
+    # Start the long-term memory search on a worker thread so it overlaps
+    # with prompt construction
+    # A repeated query was already searched and stored earlier in this
+    # session, so it skips both the memory search and the memory write
+    memory_worthy = (
+        bool(user_query)
+        and _is_memory_worthy(user_query)
+        and user_query != state.get("last_memory_query")
+    )
+    memory_task: Optional[asyncio.Task] = None
+    if memory_worthy and _cownet_memory.is_available:
+        memory_task = asyncio.create_task(
+            asyncio.to_thread(_cownet_memory.search, user_query, "cownet_user", 5)
         )
+
+    # Select the context string for the response agent
+    state_context_summary = _CTX_TABLE[
+        (bool(sna_metrics) << 2) | (bool(simulation_metrics) << 1) | bool(research_text)
+    ]
+
+    # Collect the memory search results
+    memory_context = ""
+    if memory_task is not None:
+        retrieved_memories = await memory_task
         memory_context = _format_memory_context(retrieved_memories)
         if memory_context:
             logger.info(f"Retrieved {len(retrieved_memories)} relevant memories for context")
 
-    # Build context string for the response agent
-    context_parts = []
-    if sna_metrics:
-        context_parts.append("SNA METRICS available: per-cow risk scores, centrality, herd summaries")
-    if simulation_metrics:
-        context_parts.append("SIMULATION RESULTS available: network changes after cow removal")
-    if research_text:
-        context_parts.append("RESEARCH FINDINGS available: rule-based insights + academic references")
-    if not context_parts:
-        context_parts.append("No metrics/research available - use conversation history only")
-
-    state_context_summary = " | ".join(context_parts)
-
     # Build system prompt with memory context
     memory_section = ""
     if memory_context:
@@ -270,15 +552,28 @@ Always answer the actual user question using whatever data is available.
 
     response_messages: list[BaseMessage] = [
         AIMessage(content=system_prompt),
-    ] + list(messages)
+    ] + _compact_messages(messages)
 
-    final_response = llm.invoke(response_messages)
+    # Only deterministic responses are safe to reuse
+    cache_key = None
+    response_content = None
+    if not llm.temperature:
+        cache_key = LLMResponseCache.make_key(response_messages, state_context_summary)
+        # diskcache does blocking file I/O, so keep it off the event loop
+        response_content = await asyncio.to_thread(_llm_response_cache.get, cache_key)
+        if response_content is not None:
+            logger.info("Serving response from LLM response cache")
+
+    if response_content is None:
+        response_content = await _stream_llm_response(llm, response_messages)
+        if cache_key is not None:
+            await asyncio.to_thread(_llm_response_cache.set, cache_key, response_content)
     
     # Add the conversation to long-term memory
-    if user_query and _cownet_memory.is_available:
+    if memory_worthy and _cownet_memory.is_available:
         conversation_for_memory = [
             {"role": "user", "content": user_query},
-            {"role": "assistant", "content": final_response.content}
+            {"role": "assistant", "content": response_content}
         ]
         
         # Add metadata for better memory organization
@@ -289,21 +584,10 @@ Always answer the actual user question using whatever data is available.
             "has_research": research_text is not None,
         }
         
-        _cownet_memory.add(
-            messages=conversation_for_memory,
-            user_id="cownet_user",
-            metadata=metadata
-        )
-        logger.info("Stored conversation in long-term memory")
+        # Write in the background; the caller does not need the result
+        if _submit_memory_write(
+            _cownet_memory.add, conversation_for_memory, "cownet_user", metadata
+        ):
+            logger.info("Queued conversation for long-term memory")
 
-    return Command(
-        update={
-            "messages": list(messages) + [
-                AIMessage(
-                    content=final_response.content,
-                    name="response_agent",
-                )
-            ]
-        },
-        goto=END,
-    )
+    return _final_answer(response_content, last_memory_query=user_query)
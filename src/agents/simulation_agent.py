@@ -1,15 +1,53 @@
 from typing import List
+from typing_extensions import NotRequired
+from langchain.agents import AgentState
 from langchain_core.messages import AIMessage, ToolMessage
 from langgraph.types import Command
 from ..llm.language_models import LanguageModelManager
 from ..agents.base_agent import BaseAgent
 from config import WORKING_DIRECTORY
 from core.state import GraphState
-from ..tools.simulation_tools import remove_cow_from_network, _remove_cow_from_network
+from ..tools.simulation_tools import remove_cow_from_network
+
+
+_SIM_SYSTEM_PROMPT: str = '''
+SYSTEM PROMPT:
+You are the simulation agent specializing in dairy cow social network "what-if" analysis.
+
+Your ONLY job: Use the remove_cow_from_network tool to simulate removing specific cows from the current network.
+
+WORKFLOW:
+1. Review conversation history and SNA metrics to identify the target cow(s)
+2. IMMEDIATELY call remove_cow_from_network(cow_id="COW_ID") with a valid cow from sna_graph
+3. The tool returns modified_graph + modified_metrics artifacts automatically
+4. Summarize the simulation impact in your final response
+
+RULES:
+- ONLY use remove_cow_from_network tool (no other actions/tools)
+- Select ONE cow_id based on: high conflict risk, isolation risk, or supervisor instruction
+- If several cows are named (a what-if sweep), issue one remove_cow_from_network call per cow in the SAME turn as parallel tool calls; each call is an independent scenario
+- If cow_id invalid, tool will report error - select different cow
+- ALWAYS complete simulation and return to supervisor
+
+Focus on high-risk cows from prior SNA analysis or explicit supervisor instructions.
+'''
+
+
+class SimulationAgentState(AgentState):
+    """Agent state that also carries the baseline graph for InjectedState."""
+
+    sna_graph: NotRequired[dict]
+
 
 class SimulationAgent(BaseAgent):
     """Agent responsible for running social network simulations by removing cows."""
 
+    parallel_tool_calls = True
+    state_schema = SimulationAgentState
+    # Tool messages carry whole modified graphs as artifacts; keep the inner
+    # run out of the workflow's checkpoints
+    checkpointer = False
+
     def __init__(self, language_model_manager: LanguageModelManager, team_members: List[str], working_directory: str = WORKING_DIRECTORY):
         """
         Initialize the SimulationAgent.
@@ -28,26 +66,7 @@ class SimulationAgent(BaseAgent):
 
     def _get_system_prompt(self) -> str:
         """Get the system prompt for simulation tasks."""
-        return f'''
-SYSTEM PROMPT:
-You are the simulation agent specializing in dairy cow social network "what-if" analysis.
-
-Your ONLY job: Use the remove_cow_from_network tool to simulate removing ONE specific cow from the current network.
-
-WORKFLOW:
-1. Review conversation history and SNA metrics to identify the target cow
-2. IMMEDIATELY call remove_cow_from_network(cow_id="COW_ID") with a valid cow from sna_graph
-3. The tool returns modified_graph + modified_metrics artifacts automatically
-4. Summarize the simulation impact in your final response
-
-RULES:
-- ONLY use remove_cow_from_network tool (no other actions/tools)
-- Select ONE cow_id based on: high conflict risk, isolation risk, or supervisor instruction
-- If cow_id invalid, tool will report error - select different cow
-- ALWAYS complete simulation and return to supervisor
-
-Focus on high-risk cows from prior SNA analysis or explicit supervisor instructions.
-'''
+        return _SIM_SYSTEM_PROMPT
 
     def _get_tools(self):
         """Get the simulation tool."""
@@ -58,40 +77,45 @@ simulation_agent = SimulationAgent(
     team_members=["supervisor", "sna_agent", "research_agent", "response_agent"]
 )
 
-def simulation_node(state: GraphState) -> Command:
+async def simulation_node(state: GraphState) -> Command:
     """Run simulation agent and extract content/artifact from tool message.
 
+    Every remove_cow_from_network call in the agent's turn is a separate
+    scenario. A single scenario's `simulation_metrics` is stored as-is; a
+    sweep over several cows stores them keyed by cow_id. The modified graphs
+    are not kept in state, since nothing downstream reads them.
+
     Args:
         state: The current GraphState containing messages and sna_graph.
     """
     
-    response = simulation_agent.invoke(state)
+    response = await simulation_agent.ainvoke(state)
     
     # Extract all new agent messages
     agent_messages = response.get("messages", [])
     
-    # Find the ToolMessage with content_and_artifact from remove_cow_from_network
-    simulation_content = ""
-    simulation_graph = None
+    # remove_cow_from_network returns content + artifact; read the artifacts
+    # directly instead of recomputing each removal here
+    tool_messages = [
+        msg for msg in agent_messages
+        if isinstance(msg, ToolMessage) and msg.name == remove_cow_from_network.name
+    ]
+    # Failed removals (unknown cow, no graph) have an empty artifact but their
+    # content still explains what went wrong
+    simulation_content = "\n".join(msg.content for msg in tool_messages)
+    artifacts = [msg.artifact for msg in tool_messages if getattr(msg, "artifact", None)]
     simulation_metrics = None
     
-    for msg in agent_messages:
-        if isinstance(msg, ToolMessage) and hasattr(msg, 'content'):
-            cow_id = msg.content
-            break
-        
-    if cow_id:
-        simulation_content, artifacts = _remove_cow_from_network(
-            cow_id=cow_id,
-            sna_graph=state.get("sna_graph")
-        )
-        simulation_graph = artifacts.get("modified_graph")
-        simulation_metrics = artifacts.get("modified_metrics")
+    if len(artifacts) == 1:
+        simulation_metrics = artifacts[0].get("modified_metrics")
+    elif artifacts:
+        simulation_metrics = {
+            artifact["cow_id"]: artifact["modified_metrics"] for artifact in artifacts
+        }
     
     # Prepare updates with extracted artifacts matching GraphState schema
     updates = {
         "messages": [AIMessage(content=simulation_content or "Simulation completed.", name="simulation_agent")],
-        "simulation_graph": simulation_graph,
         "simulation_metrics": simulation_metrics
     }
     
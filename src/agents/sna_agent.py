@@ -1,16 +1,78 @@
-from typing import Dict, Any, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 import networkx as nx
 from langchain_core.messages import AIMessage
 from langgraph.types import Command
 
 from core.state import GraphState
+from .data_loader import interactions_key
 from ..tools.sna_tools import (  # adjust import path to your file
-    create_social_network_graph,
+    build_social_network_graph,
     get_demo_sna_results,
 )
 
 
+# Bounded LRU of (sna_graph, sna_metrics) keyed by the interactions content
+# hash, so re-running the SNA agent on unchanged data skips the recomputation.
+# sna_node runs on executor threads, hence the lock.
+_SNA_CACHE: "OrderedDict[str, Tuple[dict, dict]]" = OrderedDict()
+_SNA_CACHE_MAX_SIZE = 16
+_SNA_CACHE_LOCK = threading.Lock()
+
+
+def _sna_cache_get(key: str) -> Optional[Tuple[dict, dict]]:
+    """Look up cached SNA results and mark them as recently used."""
+    with _SNA_CACHE_LOCK:
+        cached = _SNA_CACHE.get(key)
+        if cached is not None:
+            _SNA_CACHE.move_to_end(key)
+        return cached
+
+
+def _sna_cache_put(key: str, sna_graph: dict, sna_metrics: dict) -> None:
+    """Store SNA results, evicting the least recently used entry when full."""
+    with _SNA_CACHE_LOCK:
+        _SNA_CACHE[key] = (sna_graph, sna_metrics)
+        _SNA_CACHE.move_to_end(key)
+        if len(_SNA_CACHE) > _SNA_CACHE_MAX_SIZE:
+            _SNA_CACHE.popitem(last=False)
+
+
+def _interaction_counts(interactions: Any) -> Optional[pd.DataFrame]:
+    """
+    Aggregate interaction records into per-pair counts.
+
+    Interactions are undirected, so (a, b) and (b, a) count towards the same
+    pair. Returns a DataFrame with 'cow_i' <= 'cow_j', 'count' sorted by pair
+    (as groupby would), or None if either cow column is missing.
+    """
+    # Only the pair columns are needed, so skip materializing the others
+    pairs = pd.DataFrame.from_records(interactions, columns=["cow_i", "cow_j"])
+    if pairs["cow_i"].isna().all() or pairs["cow_j"].isna().all():
+        return None
+
+    # Code both columns against one sorted id table, so ordering codes orders
+    # ids; missing ids (code -1) are dropped like groupby drops NaN keys
+    codes, cows = pd.factorize(
+        pd.concat([pairs["cow_i"], pairs["cow_j"]], ignore_index=True), sort=True
+    )
+    codes_i, codes_j = codes[:len(pairs)], codes[len(pairs):]
+    valid = (codes_i >= 0) & (codes_j >= 0)
+    lo = np.minimum(codes_i[valid], codes_j[valid]).astype(np.int64)
+    hi = np.maximum(codes_i[valid], codes_j[valid])
+
+    # Count canonical pairs; sorted keys keep groupby's pair order
+    keys, counts = np.unique(lo * len(cows) + hi, return_counts=True)
+    return pd.DataFrame({
+        "cow_i": cows[keys // len(cows)],
+        "cow_j": cows[keys % len(cows)],
+        "count": counts,
+    })
+
+
 def sna_node(state: GraphState) -> Command:
     """
     SNA node for the CowNet multi-agent system.
@@ -20,17 +82,17 @@ def sna_node(state: GraphState) -> Command:
       interaction_counts DataFrame.
     - Build the social network graph (sna_graph) with inverse-distance weights.
     - Compute per-cow and herd-level SNA metrics + risk scores.
-    - Write results into state['sna_graph'] and state['sna_metrics'].
+    - Write results into state['sna_graph'] and state['sna_metrics'], plus the
+      interactions hash in state['sna_key'] so stale results can be detected.
     - Route back to the supervisor.
     """
-    messages: List[Any] = list(state.get("messages", []))
     interactions = state.get("interactions")
 
     if not interactions:
         # No data → cannot run SNA
         return Command(
             update={
-                "messages": messages + [
+                "messages": [
                     AIMessage(
                         content=(
                             "SNA Agent: No interaction data found in state['interactions']. "
@@ -43,69 +105,70 @@ def sna_node(state: GraphState) -> Command:
             goto="supervisor",
         )
 
-    # interactions is a list[dict] from data_loader_node
-    interactions_df = pd.DataFrame(interactions)
-
-    # Expect columns 'cow_i', 'cow_j' at minimum
-    if not {"cow_i", "cow_j"}.issubset(interactions_df.columns):
-        return Command(
-            update={
-                "messages": messages + [
-                    AIMessage(
-                        content=(
-                            "SNA Agent: Interaction data is missing 'cow_i' or 'cow_j' columns. "
-                            "Cannot build the social network graph."
-                        ),
-                        name="sna_agent",
-                    )
-                ]
-            },
-            goto="supervisor",
-        )
-
-    # Aggregate interaction counts per pair (no week separation for demo)
-    interaction_counts = (
-        interactions_df.groupby(["cow_i", "cow_j"])
-        .size()
-        .reset_index(name="count")
-    )
-
-    if interaction_counts.empty:
-        return Command(
-            update={
-                "messages": messages + [
-                    AIMessage(
-                        content=(
-                            "SNA Agent: Interaction dataset is empty after aggregation. "
-                            "No graph or metrics were computed."
-                        ),
-                        name="sna_agent",
-                    )
-                ]
-            },
-            goto="supervisor",
-        )
-
-    # 1) Build social network graph (dict-of-dicts) using your helper
-    sna_graph_dict = create_social_network_graph(interaction_counts)
-
-    # 2) Rebuild a NetworkX graph from that dict for metric computation
-    G = nx.from_dict_of_dicts(sna_graph_dict)
-
-    # 3) Compute per-cow / herd-level metrics and risk scores
-    sna_results = get_demo_sna_results(G)
-    # sna_results structure:
-    # {
-    #   'herd_metrics': {...},
-    #   'per_cow_metrics': {cow_id: {...}},
-    #   'risk_scores': {cow_id: {...}},
-    #   'top_risk_cows': [...]
-    # }
+    # The loader records the key; hash only for states that predate it
+    sna_key = state.get("interactions_key") or interactions_key(interactions)
+    cached = _sna_cache_get(sna_key)
+    if cached is not None:
+        sna_graph_dict, sna_results = cached
+    else:
+        # interactions is a list[dict] from data_loader_node
+        interaction_counts = _interaction_counts(interactions)
+
+        # Expect columns 'cow_i', 'cow_j' at minimum
+        if interaction_counts is None:
+            return Command(
+                update={
+                    "messages": [
+                        AIMessage(
+                            content=(
+                                "SNA Agent: Interaction data is missing 'cow_i' or 'cow_j' columns. "
+                                "Cannot build the social network graph."
+                            ),
+                            name="sna_agent",
+                        )
+                    ]
+                },
+                goto="supervisor",
+            )
+
+        if interaction_counts.empty:
+            return Command(
+                update={
+                    "messages": [
+                        AIMessage(
+                            content=(
+                                "SNA Agent: Interaction dataset is empty after aggregation. "
+                                "No graph or metrics were computed."
+                            ),
+                            name="sna_agent",
+                        )
+                    ]
+                },
+                goto="supervisor",
+            )
+
+        # 1) Build the social network graph once; metrics run on it directly
+        G = build_social_network_graph(interaction_counts)
+
+        # 2) Serialize it once as a dict-of-dicts for state
+        sna_graph_dict = nx.to_dict_of_dicts(G)
+
+        # 3) Compute per-cow / herd-level metrics and risk scores
+        sna_results = get_demo_sna_results(G)
+        # sna_results structure:
+        # {
+        #   'herd_metrics': {...},
+        #   'per_cow_metrics': {cow_id: {...}},
+        #   'risk_scores': {cow_id: {...}},
+        #   'top_risk_cows': [...]
+        # }
+
+        _sna_cache_put(sna_key, sna_graph_dict, sna_results)
 
     # Prepare a short summary message
     herd_metrics = sna_results.get("herd_metrics", {})
-    num_cows = herd_metrics.get("num_cows", G.number_of_nodes())
-    num_edges = herd_metrics.get("num_edges", G.number_of_edges())
+    num_cows = herd_metrics.get("num_cows", len(sna_graph_dict))
+    num_edges = herd_metrics.get("num_edges", 0)
     top_risks = sna_results.get("top_risk_cows", [])
 
     if top_risks:
@@ -126,7 +189,8 @@ def sna_node(state: GraphState) -> Command:
         update={
             "sna_graph": sna_graph_dict,
             "sna_metrics": sna_results,  # store full metrics bundle
-            "messages": messages + [
+            "sna_key": sna_key,
+            "messages": [
                 AIMessage(content=summary, name="sna_agent")
             ],
         },
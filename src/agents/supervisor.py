@@ -1,29 +1,39 @@
-from typing import Literal
+import functools
+import re
+from typing import List, Literal, get_args
+import httpx
 from pydantic import BaseModel, Field
 from langchain_core.messages import AIMessage
-from langgraph.types import Command
+from langchain_core.runnables import RunnableConfig
+from langgraph.types import Command, Send
 from langchain_openai import ChatOpenAI
 from core.state import GraphState
+from llm.openai_provider import get_shared_http_async_client
 
 
 class CowNetSupervisor(BaseModel):
-    next: Literal[
-        "data_loader_agent",
-        "sna_agent",
-        "response_agent",
-        "simulation_agent",
-        "research_agent",
-        "report_agent",
+    next: List[
+        Literal[
+            "data_loader_agent",
+            "sna_agent",
+            "response_agent",
+            "simulation_agent",
+            "research_agent",
+            "report_agent",
+        ]
     ] = Field(
+        min_length=1,
         description=(
-            "Determines which specialist agent to activate next in the workflow: "
+            "Determines which specialist agent(s) to activate next in the workflow. "
+            "Usually a single agent; list several only when they are independent "
+            "and can run concurrently (e.g. ['sna_agent', 'research_agent']). "
             "'data_loader_agent' to (re)load or refresh interaction data; "
             "'sna_agent' for computing or updating social network analysis metrics; "
             "'response_agent' for farmer-friendly responses and explanations; "
             "'simulation_agent' for what-if network scenarios; "
             "'research_agent' for consulting rules/intents and combining them with metrics; "
             "'report_agent' for generating a farmer-friendly PDF briefing."
-        )
+        ),
     )
     reason: str = Field(
         description=(
@@ -33,41 +43,21 @@ class CowNetSupervisor(BaseModel):
     )
 
 
-def cownet_supervisor_node(
-    state: GraphState,
-) -> Command[
-    Literal[
-        "data_loader_agent",
-        "sna_agent",
-        "response_agent",
-        "simulation_agent",
-        "research_agent",
-        "report_agent",
-    ]
-]:
-    """
-    Supervisor node for the CowNet multi-agent system.
-
-    Routes among:
-      - data_loader_agent: (re)load interaction data from source files.
-      - sna_agent: social network analysis (build/update graph, compute metrics).
-      - response_agent: respond or explain metrics/simulations to the farmer.
-      - simulation_agent: run what-if graph manipulation scenarios.
-      - research_agent: retrieve/apply rules/intents and combine them with metrics.
-    """
-    llm = ChatOpenAI(
-        model="gpt-5-mini",
-        temperature=0.0,
-    )
+# Agents that only write their own state keys and report back to the
+# supervisor, so several of them can safely run in the same superstep.
+# simulation_agent is not one of them: it reads sna_graph, so it must run
+# after sna_agent rather than beside it. Its own what-if sweeps run in
+# parallel inside the agent as parallel tool calls.
+_FAN_OUT_AGENTS = frozenset({"sna_agent", "research_agent"})
 
-    system_prompt = """
+_SYSTEM_PROMPT = """
 You are the Supervisor for the CowNet multi-agent dairy herd decision support system.
 Your mission: autonomously orchestrate agents to fulfill the user’s request end-to-end without asking clarifying questions. Use semantic understanding, intent detection, and reasoning over state. Prefer action with reasonable defaults over clarification.
 
 Agents and roles:
 - data_loader_agent: Load/refresh interaction data into state['interactions'].
 - sna_agent: Build/update the social network (state['sna_graph']) and compute metrics (state['sna_metrics']).
-- simulation_agent: Run what‑if scenarios (e.g., remove a cow); update state['simulation_graph'], state['simulation_metrics'].
+- simulation_agent: Run what‑if scenarios (e.g., remove a cow); update state['simulation_metrics'].
 - research_agent: Produce evidence-based synthesis into state['research'] (rules/intents + external research tools when available).
 - report_agent: Generate a farmer‑friendly PDF report using SNA + research (+ optional simulation).
 - response_agent: Provide the final concise answer to the user’s question.
@@ -76,7 +66,7 @@ Accessible state:
 - messages: conversation history
 - interactions: raw interaction records
 - sna_graph, sna_metrics
-- simulation_graph, simulation_metrics
+- simulation_metrics
 - research
 
 Non-clarification policy:
@@ -98,38 +88,161 @@ Planning and routing policy:
    - Don’t reload data if interactions exist and there’s no hint of updates.
    - Don’t recompute SNA unless interactions changed or the user implies freshness.
    - Don’t run simulation without a clear hypothetical/change request.
-5) Ambiguity handling:
+5) Parallel prerequisites:
+   - When several prerequisites do not depend on each other, return them together so they run concurrently (e.g. NEXT: sna_agent, research_agent when interactions exist but neither metrics nor research do).
+   - Only sna_agent and research_agent may be combined; data_loader_agent, simulation_agent, response_agent and report_agent are always returned alone.
+6) Ambiguity handling:
    - When intent is unclear, pick the next action that most increases useful information toward a likely goal (typically sna_agent if no metrics; otherwise response_agent).
-6) Output:
-   - Return:
-     * next: one of ["data_loader_agent","sna_agent","response_agent","simulation_agent","research_agent","report_agent"]
-     * reason: brief justification citing user intent and missing/present state.
+7) Output:
+   - Respond with exactly two lines and nothing else:
+     NEXT: <agent>[, <agent> ...]
+     REASON: <brief justification citing user intent and missing/present state>
+   - Valid agents: data_loader_agent, sna_agent, response_agent, simulation_agent, research_agent, report_agent.
 
 Semantic examples (not keyword-matching; use meaning and context):
-- “Brief me with a report.” → If no metrics/research: data_loader_agent → sna_agent → research_agent → report_agent (one step per loop). If metrics+research present → report_agent.
+- “Brief me with a report.” → If no metrics/research: data_loader_agent → ["sna_agent","research_agent"] in parallel → report_agent. If metrics+research present → report_agent.
 - “What if we remove cow T02?” → simulation_agent (ensure sna_graph exists; if not, run sna_agent first).
+- “What if we remove T02, T05 or T09?” → simulation_agent once; it sweeps all named cows in parallel.
 - “Compute latest herd metrics.” → sna_agent (load data first if missing).
 - “Explain why isolation risk is high.” → If metrics missing → sna_agent, then research_agent; finally response_agent.
 """
 
-    messages = [
-        {"role": "system", "content": system_prompt},
-    ] + state["messages"]
+# Valid routing targets, derived once from the CowNetSupervisor schema
+_NEXT_SET = frozenset(get_args(get_args(CowNetSupervisor.model_fields["next"].annotation)[0]))
+
+# The decision is read from a plain "NEXT: ...\nREASON: ..." completion rather
+# than JSON-mode structured output
+_ROUTING_RE = re.compile(r"NEXT:\s*([\w,\s]+?)\s*\n\s*REASON:\s*(.+)", re.S)
+
+
+def _parse_routing(content: str) -> CowNetSupervisor:
+    """Parse the supervisor completion, falling back to response_agent."""
+    match = _ROUTING_RE.search(content)
+    if match is None:
+        return CowNetSupervisor.model_construct(next=["response_agent"], reason=content.strip())
+    targets = [
+        agent
+        for agent in (name.strip() for name in match.group(1).split(","))
+        if agent in _NEXT_SET
+    ]
+    return CowNetSupervisor.model_construct(
+        next=targets or ["response_agent"],
+        reason=match.group(2).strip(),
+    )
+
 
-    response: CowNetSupervisor = llm.with_structured_output(CowNetSupervisor).invoke(
-        messages
+@functools.lru_cache(maxsize=1)
+def _supervisor_llm(http_client: httpx.AsyncClient) -> ChatOpenAI:
+    """
+    Supervisor LLM bound to the given HTTP client.
+
+    Reused on every hop; keyed on the client so a fresh one is built after
+    the shared client is closed and replaced.
+    """
+    return ChatOpenAI(
+        model="gpt-5-mini",
+        temperature=0.0,
+        http_async_client=http_client,
     )
 
-    goto = response.next
+
+def _sna_is_fresh(state: GraphState) -> bool:
+    """Whether state['sna_graph'] was computed from the current interactions."""
+    sna_key = state.get("sna_key")
+    return (
+        sna_key is not None
+        and state.get("sna_graph") is not None
+        and state.get("interactions_key") == sna_key
+    )
+
+
+# Added after the history when SNA results are current, so the model plans
+# the next real step instead of asking for a rebuild
+_SNA_FRESH_NOTE = {
+    "role": "system",
+    "content": (
+        "STATE NOTE: sna_graph and sna_metrics are already current for the loaded "
+        "interactions. Do not route to sna_agent; choose the next step toward the "
+        "user's goal."
+    ),
+}
+
+
+def _route_targets(response: CowNetSupervisor, sna_fresh: bool) -> List[str]:
+    """Deduplicated routing targets, without fan-out conflicts or a fresh SNA rebuild."""
+    targets = list(dict.fromkeys(response.next))
+    if len(targets) > 1:
+        targets = [agent for agent in targets if agent in _FAN_OUT_AGENTS] or targets[:1]
+    if sna_fresh:
+        targets = [agent for agent in targets if agent != "sna_agent"]
+    return targets
+
+
+async def cownet_supervisor_node(
+    state: GraphState,
+    config: RunnableConfig,
+) -> Command[
+    Literal[
+        "data_loader_agent",
+        "sna_agent",
+        "response_agent",
+        "simulation_agent",
+        "research_agent",
+        "report_agent",
+    ]
+]:
+    """
+    Supervisor node for the CowNet multi-agent system.
+
+    Routes among:
+      - data_loader_agent: (re)load interaction data from source files.
+      - sna_agent: social network analysis (build/update graph, compute metrics).
+      - response_agent: respond or explain metrics/simulations to the farmer.
+      - simulation_agent: run what-if graph manipulation scenarios.
+      - research_agent: retrieve/apply rules/intents and combine them with metrics.
+
+    When the model names several independent agents, they are dispatched in
+    parallel with `Send` and each reports back to the supervisor.
+    """
+    # The static system prompt always leads, so provider prefix caching applies
+    messages = [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+    ] + list(state["messages"])
+    sna_fresh = _sna_is_fresh(state)
+    if sna_fresh:
+        messages.append(_SNA_FRESH_NOTE)
+
+    # Passing the node's config keeps callbacks, tracing and event streaming
+    completion = await _supervisor_llm(get_shared_http_async_client()).ainvoke(messages, config)
+    response = _parse_routing(completion.content)
+    targets = _route_targets(response, sna_fresh)
+
+    if not targets:
+        # The model still asked only for an SNA rebuild; re-route once with
+        # that step marked as done
+        messages += [
+            AIMessage(content=completion.content),
+            {
+                "role": "system",
+                "content": "sna_agent skipped: SNA results are already current. Choose the next step.",
+            },
+        ]
+        completion = await _supervisor_llm(get_shared_http_async_client()).ainvoke(messages, config)
+        response = _parse_routing(completion.content)
+        targets = _route_targets(response, sna_fresh) or ["response_agent"]
     reason = response.reason
 
-    print(f"--- CowNet Workflow Transition: Supervisor → {goto.upper()} ---")
+    print(
+        "--- CowNet Workflow Transition: Supervisor → "
+        f"{' + '.join(agent.upper() for agent in targets)} ---"
+    )
+
+    goto = targets[0] if len(targets) == 1 else [Send(agent, state) for agent in targets]
 
+    # Return only the delta; the add_messages reducer appends it
     return Command(
         update={
-            "messages": state["messages"] + [
-                AIMessage(content=reason, name="supervisor")
-            ]
+            "messages": [AIMessage(content=reason, name="supervisor")]
         },
         goto=goto,
     )
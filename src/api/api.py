@@ -6,32 +6,41 @@ including chat functionality with PostgreSQL checkpointing and session managemen
 """
 
 import os
+import re
 import sys
+import json
+import hashlib
+import asyncio
+import importlib
 import uuid
 import tempfile
 import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
 from typing import Optional, List
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, Depends, Header, UploadFile, File, Form
+import aiofiles
+import orjson
+from fastapi import FastAPI, HTTPException, Depends, Header, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from langchain_core.messages import HumanMessage, AIMessage, BaseMessage
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.workflow import (
-    run_workflow_async,
-    CowNetCheckpointerConfig,
-    get_thread_history,
-    close_connection_pool,
-)
+# core.workflow (LangGraph, LangChain, agents) is imported in the background
+# at startup so the server can answer /health while it loads
 from logger import get_logger
 from api.file_validation import (
     FileType,
     ValidationResult,
     validate_file,
+    get_cached_validation,
+    cache_validation,
     move_validated_file,
     cleanup_temp_file,
 )
@@ -46,17 +55,74 @@ logger = get_logger(__name__)
 TEMP_UPLOAD_DIR = os.path.join(os.path.dirname(__file__), '..', 'temp_uploads')
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 
+# Comma-separated list of allowed frontend origins ("*" allows any origin,
+# without credentials)
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+]
+
+# Short chit-chat answered directly, without a supervisor round trip
+_TRIVIAL_INTENT_RE = re.compile(
+    r"^\s*(?:"
+    r"(?P<greeting>hi|hello|hey|good (?:morning|afternoon|evening))"
+    r"|(?P<thanks>thanks|thank you|thx|cheers)"
+    r"|(?P<farewell>bye|goodbye|see you)"
+    r")[\s!.,]*$",
+    re.IGNORECASE,
+)
+_TRIVIAL_MAX_LENGTH = 40
+_TRIVIAL_REPLIES = {
+    "greeting": (
+        "Hello! I'm CowNet AI. Ask me about your herd's social network, "
+        "risk scores, what-if scenarios or a PDF briefing."
+    ),
+    "thanks": "You're welcome! Let me know if there is anything else about your herd.",
+    "farewell": "Goodbye! Come back any time you need insights on your herd.",
+}
+
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Form value -> FileType, and the 400 detail for anything else
+_VALID_FILE_TYPES = {ft.value: ft for ft in FileType}
+_INVALID_FILE_TYPE_DETAIL = f"Invalid file_type. Must be one of: {', '.join(_VALID_FILE_TYPES)}"
+
+# CSV validation is CPU-bound pandas work, so it runs in worker processes
+# where concurrent uploads are not serialized on the GIL. Workers are spawned
+# (not forked) because the server process runs an event loop and threads.
+VALIDATION_WORKERS = int(os.getenv("VALIDATION_WORKERS", str(os.cpu_count() or 1)))
+_VALIDATION_POOL = ProcessPoolExecutor(
+    max_workers=VALIDATION_WORKERS,
+    mp_context=multiprocessing.get_context("spawn"),
+)
+
 # Ensure directories exist
 os.makedirs(TEMP_UPLOAD_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
+def classify_trivial_intent(message: str) -> Optional[str]:
+    """
+    Detect greetings, thanks and farewells that need no agent work.
+    
+    Returns the intent name (a key of `_TRIVIAL_REPLIES`) or None.
+    """
+    if len(message) > _TRIVIAL_MAX_LENGTH:
+        return None
+    match = _TRIVIAL_INTENT_RE.match(message)
+    return match.lastgroup if match else None
+
+
 # ============================================================================
 # Pydantic Models
 # ============================================================================
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     message: str = Field(..., description="User message to send to CowNet AI")
     user_id: Optional[str] = Field(None, description="User identifier for session tracking")
     thread_id: Optional[str] = Field(None, description="Thread identifier for conversation continuity")
@@ -105,10 +171,13 @@ class FileUploadResponse(BaseModel):
     errors: List[str] = Field(default_factory=list, description="Validation errors if any")
     warnings: List[str] = Field(default_factory=list, description="Validation warnings if any")
     destination_path: Optional[str] = Field(None, description="Final destination path if validated")
+    cache_hit: bool = Field(False, description="Whether the validation result came from the cache")
 
 
 class FileValidationRequest(BaseModel):
     """Request model for validating an already uploaded file."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     file_id: str = Field(..., description="File ID from the upload response")
     file_type: str = Field(..., description="Type of file: cow_location, cow_registry, or pen_assignment")
 
@@ -117,15 +186,41 @@ class FileValidationRequest(BaseModel):
 # Application Lifecycle
 # ============================================================================
 
+async def _load_workflow(app: FastAPI) -> ModuleType:
+    """Import the workflow module off the event loop, open its pool and compile the graph."""
+    workflow = await asyncio.to_thread(importlib.import_module, "core.workflow")
+    app.state.pool = await workflow.init_connection_pool()
+    app.state.graph = await workflow.get_compiled_graph(app.state.pool)
+    app.state.keep_alive_task = asyncio.create_task(workflow.keep_connection_pool_alive())
+    logger.info("CowNet workflow loaded")
+    return workflow
+
+
+async def get_workflow(request: Request) -> ModuleType:
+    """Dependency that waits for the workflow module to finish loading."""
+    return await request.app.state.workflow_task
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup/shutdown events."""
     # Startup
     logger.info("Starting CowNet API server...")
+    app.state.workflow_task = asyncio.create_task(_load_workflow(app))
     yield
     # Shutdown
     logger.info("Shutting down CowNet API server...")
-    await close_connection_pool()
+    _VALIDATION_POOL.shutdown(wait=False, cancel_futures=True)
+    workflow_task = app.state.workflow_task
+    if not workflow_task.done():
+        workflow_task.cancel()
+        return
+    if workflow_task.exception() is None:
+        from llm.openai_provider import close_shared_http_async_client
+        
+        app.state.keep_alive_task.cancel()
+        await workflow_task.result().close_connection_pool()
+        await close_shared_http_async_client()
 
 
 # ============================================================================
@@ -137,13 +232,15 @@ app = FastAPI(
     description="REST API for interacting with the CowNet Multi-Agent System for cattle disease risk analysis",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS,
+    # Credentials cannot be combined with a wildcard origin
+    allow_credentials="*" not in CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -153,6 +250,10 @@ app.add_middleware(
 # API Endpoints
 # ============================================================================
 
+# The health payload never changes, so it is serialized once
+_HEALTH_BYTES = orjson.dumps(HealthResponse(status="healthy", version="1.0.0").model_dump())
+
+
 @app.get("/health", response_model=HealthResponse, tags=["System"])
 async def health_check():
     """
@@ -160,10 +261,26 @@ async def health_check():
     
     Returns the API status and version information.
     """
-    return HealthResponse(
-        status="healthy",
-        version="1.0.0"
-    )
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
+
+
+@app.get("/health/ready", tags=["System"])
+async def readiness_check(request: Request):
+    """
+    Readiness check endpoint.
+    
+    Reports whether the workflow has loaded, and the checkpointer connection
+    pool statistics once it has.
+    """
+    workflow_task = request.app.state.workflow_task
+    if not workflow_task.done():
+        return ORJSONResponse({"status": "loading"}, status_code=503)
+    if workflow_task.exception() is not None:
+        return ORJSONResponse(
+            {"status": "failed", "error": str(workflow_task.exception())},
+            status_code=503,
+        )
+    return {"status": "ready", "pool": request.app.state.pool.get_stats()}
 
 
 # ============================================================================
@@ -189,13 +306,9 @@ async def upload_file(
     Returns validation results and destination path if successful.
     """
     # Validate file_type parameter
-    try:
-        validated_file_type = FileType(file_type)
-    except ValueError:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file_type. Must be one of: {', '.join([ft.value for ft in FileType])}"
-        )
+    validated_file_type = _VALID_FILE_TYPES.get(file_type)
+    if validated_file_type is None:
+        raise HTTPException(status_code=400, detail=_INVALID_FILE_TYPE_DETAIL)
     
     # Check file extension
     if not file.filename.lower().endswith('.csv'):
@@ -211,19 +324,31 @@ async def upload_file(
     temp_file_path = os.path.join(TEMP_UPLOAD_DIR, f"{file_id}_{file.filename}")
     
     try:
-        # Save uploaded file to temp directory
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Stream the upload to temp storage without blocking the event loop,
+        # hashing the content on the way
+        hasher = hashlib.blake2b()
+        async with aiofiles.open(temp_file_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                await buffer.write(chunk)
+        digest = hasher.hexdigest()
         
         logger.info(f"File uploaded to temp storage: {temp_file_path}")
         
-        # Validate the file
-        validation_result = validate_file(temp_file_path, validated_file_type)
+        # Validate the file (pandas parsing runs in a worker process), unless
+        # identical content was already validated for this file type
+        validation_result = get_cached_validation(digest, validated_file_type)
+        cache_hit = validation_result is not None
+        if not cache_hit:
+            validation_result = await asyncio.get_running_loop().run_in_executor(
+                _VALIDATION_POOL, validate_file, temp_file_path, validated_file_type
+            )
+            cache_validation(digest, validated_file_type, validation_result)
         
         if validation_result.is_valid:
             # Move to data directory
-            success, dest_path, error = move_validated_file(
+            success, dest_path, error = await asyncio.to_thread(
+                move_validated_file,
                 temp_file_path,
                 DATA_DIR,
                 validated_file_type
@@ -239,7 +364,8 @@ async def upload_file(
                     is_valid=True,
                     errors=[],
                     warnings=validation_result.warnings,
-                    destination_path=dest_path
+                    destination_path=dest_path,
+                    cache_hit=cache_hit
                 )
             else:
                 # Cleanup temp file if move failed
@@ -260,7 +386,8 @@ async def upload_file(
                 is_valid=False,
                 errors=validation_result.errors,
                 warnings=validation_result.warnings,
-                destination_path=None
+                destination_path=None,
+                cache_hit=cache_hit
             )
             
     except HTTPException:
@@ -275,6 +402,43 @@ async def upload_file(
         )
 
 
+# The supported schemas never change, so the /upload/types payload is serialized once
+_FILE_TYPES_BYTES = orjson.dumps({
+    "file_types": [
+        {
+            "type": "cow_location",
+            "description": "Cow location tracking data",
+            "required_columns": {
+                "cow_id": "uuid or int - Unique identifier for the cow",
+                "timestamp": "UNIX timestamp - Time of the location reading",
+                "x_coor": "float - X coordinate",
+                "y_coor": "float - Y coordinate",
+                "z_coor": "float - Z coordinate"
+            }
+        },
+        {
+            "type": "cow_registry",
+            "description": "Cow registry and metadata",
+            "required_columns": {
+                "cow_id": "uuid or int - Unique identifier for the cow",
+                "parity": "int - Number of times the cow has given birth",
+                "lactation_stage": "string - Current lactation stage",
+                "week_id": "ISO-8601 week format (YYYY-Www) - Week identifier"
+            }
+        },
+        {
+            "type": "pen_assignment",
+            "description": "Cow pen assignment data",
+            "required_columns": {
+                "cow_id": "uuid or int - Unique identifier for the cow",
+                "pen_id": "int - Identifier for the pen",
+                "week_id": "ISO-8601 week format (YYYY-Www) - Week identifier"
+            }
+        }
+    ]
+})
+
+
 @app.get("/upload/types", tags=["File Upload"])
 async def get_file_types():
     """
@@ -283,40 +447,7 @@ async def get_file_types():
     Returns information about each file type including required columns
     and their expected data types.
     """
-    return {
-        "file_types": [
-            {
-                "type": "cow_location",
-                "description": "Cow location tracking data",
-                "required_columns": {
-                    "cow_id": "uuid or int - Unique identifier for the cow",
-                    "timestamp": "UNIX timestamp - Time of the location reading",
-                    "x_coor": "float - X coordinate",
-                    "y_coor": "float - Y coordinate",
-                    "z_coor": "float - Z coordinate"
-                }
-            },
-            {
-                "type": "cow_registry",
-                "description": "Cow registry and metadata",
-                "required_columns": {
-                    "cow_id": "uuid or int - Unique identifier for the cow",
-                    "parity": "int - Number of times the cow has given birth",
-                    "lactation_stage": "string - Current lactation stage",
-                    "week_id": "ISO-8601 week format (YYYY-Www) - Week identifier"
-                }
-            },
-            {
-                "type": "pen_assignment",
-                "description": "Cow pen assignment data",
-                "required_columns": {
-                    "cow_id": "uuid or int - Unique identifier for the cow",
-                    "pen_id": "int - Identifier for the pen",
-                    "week_id": "ISO-8601 week format (YYYY-Www) - Week identifier"
-                }
-            }
-        ]
-    }
+    return Response(content=_FILE_TYPES_BYTES, media_type="application/json")
 
 
 @app.delete("/upload/temp/{file_id}", tags=["File Upload"])
@@ -328,14 +459,15 @@ async def delete_temp_file(file_id: str):
     
     - **file_id**: The file ID returned from the upload endpoint
     """
-    # Find files with matching ID prefix
+    # Find files with matching ID prefix (uploads are saved as "<file_id>_<name>")
+    prefix = f"{file_id}_"
     deleted = False
-    for filename in os.listdir(TEMP_UPLOAD_DIR):
-        if filename.startswith(file_id):
-            file_path = os.path.join(TEMP_UPLOAD_DIR, filename)
-            if cleanup_temp_file(file_path):
-                deleted = True
-                logger.info(f"Deleted temp file: {file_path}")
+    with os.scandir(TEMP_UPLOAD_DIR) as entries:
+        for entry in entries:
+            if entry.name.startswith(prefix) and entry.is_file():
+                if cleanup_temp_file(entry.path):
+                    deleted = True
+                    logger.info(f"Deleted temp file: {entry.path}")
     
     if deleted:
         return {"message": f"Temporary file(s) with ID {file_id} deleted successfully"}
@@ -347,7 +479,11 @@ async def delete_temp_file(file_id: str):
 
 
 @app.post("/chat", response_model=ChatResponse, tags=["Chat"])
-async def chat(request: ChatRequest):
+async def chat(
+    request: ChatRequest,
+    http_request: Request,
+    workflow: ModuleType = Depends(get_workflow),
+):
     """
     Send a message to the CowNet AI system.
     
@@ -362,7 +498,7 @@ async def chat(request: ChatRequest):
     """
     try:
         # Create checkpointer config
-        config = CowNetCheckpointerConfig(
+        config = workflow.CowNetCheckpointerConfig(
             user_id=request.user_id,
             thread_id=request.thread_id
         )
@@ -370,26 +506,39 @@ async def chat(request: ChatRequest):
         # Create message
         messages = [HumanMessage(content=request.message)]
         
+        # Chit-chat gets a canned reply; only record it in the thread history
+        intent = classify_trivial_intent(request.message)
+        if intent is not None:
+            final_response = _TRIVIAL_REPLIES[intent]
+            await workflow.record_exchange(
+                messages + [AIMessage(content=final_response, name="response_agent")],
+                config=config,
+                pool=http_request.app.state.pool,
+            )
+            return ChatResponse(
+                response=final_response,
+                user_id=config.user_id,
+                thread_id=config.thread_id
+            )
+        
         # Run the workflow
-        result = await run_workflow_async(
+        result = await workflow.run_workflow_async(
             messages=messages,
-            config=config
+            config=config,
+            pool=http_request.app.state.pool,
         )
         
-        # Extract the final response
-        response_messages = result.get("messages", [])
-        if not response_messages:
-            raise HTTPException(
-                status_code=500,
-                detail="No response generated from workflow"
-            )
-        
-        # Get the last AI message
-        final_response = ""
-        for msg in reversed(response_messages):
-            if isinstance(msg, AIMessage):
-                final_response = msg.content
-                break
+        # The terminal agent writes its answer to the final_response channel
+        final_response = result.get("final_response")
+        if not final_response:
+            response_messages = result.get("messages", [])
+            if not response_messages:
+                raise HTTPException(
+                    status_code=500,
+                    detail="No response generated from workflow"
+                )
+            last_message = response_messages[-1]
+            final_response = last_message.content if isinstance(last_message, AIMessage) else ""
         
         if not final_response:
             final_response = "I apologize, but I couldn't generate a response. Please try again."
@@ -411,7 +560,10 @@ async def chat(request: ChatRequest):
 
 
 @app.post("/threads/new", response_model=NewThreadResponse, tags=["Threads"])
-async def create_new_thread(user_id: Optional[str] = None):
+async def create_new_thread(
+    user_id: Optional[str] = None,
+    workflow: ModuleType = Depends(get_workflow),
+):
     """
     Create a new conversation thread.
     
@@ -422,7 +574,7 @@ async def create_new_thread(user_id: Optional[str] = None):
     
     Returns the new thread configuration.
     """
-    config = CowNetCheckpointerConfig(user_id=user_id)
+    config = workflow.CowNetCheckpointerConfig(user_id=user_id)
     
     return NewThreadResponse(
         user_id=config.user_id,
@@ -434,7 +586,8 @@ async def create_new_thread(user_id: Optional[str] = None):
 @app.get("/threads/{thread_id}/history", response_model=ThreadHistoryResponse, tags=["Threads"])
 async def get_conversation_history(
     thread_id: str,
-    user_id: Optional[str] = Header(None, alias="X-User-ID")
+    user_id: Optional[str] = Header(None, alias="X-User-ID"),
+    workflow: ModuleType = Depends(get_workflow),
 ):
     """
     Retrieve conversation history for a specific thread.
@@ -445,28 +598,31 @@ async def get_conversation_history(
     Returns the list of messages in the conversation thread.
     """
     try:
-        config = CowNetCheckpointerConfig(
+        config = workflow.CowNetCheckpointerConfig(
             user_id=user_id or "anonymous",
             thread_id=thread_id
         )
         
-        history = await get_thread_history(config)
-        
-        # Extract messages from checkpoints
-        messages = []
-        for checkpoint in history:
-            if checkpoint and "channel_values" in checkpoint:
-                channel_messages = checkpoint["channel_values"].get("messages", [])
-                for msg in channel_messages:
-                    if isinstance(msg, HumanMessage):
-                        messages.append(MessageHistory(role="user", content=msg.content))
-                    elif isinstance(msg, AIMessage):
-                        messages.append(MessageHistory(role="assistant", content=msg.content))
+        # The latest checkpoint already holds the full conversation
+        latest = await workflow.get_latest_checkpoint(config)
+        channel_messages = latest["channel_values"].get("messages", []) if latest else []
+        messages = [
+            MessageHistory(
+                role="user" if isinstance(msg, HumanMessage) else "assistant",
+                content=msg.content,
+            )
+            for msg in channel_messages
+            if isinstance(msg, (HumanMessage, AIMessage))
+        ]
         
-        return ThreadHistoryResponse(
-            user_id=config.user_id,
-            thread_id=thread_id,
-            messages=messages
+        # Returning a Response directly skips FastAPI's re-validation of a
+        # payload that was just built from trusted state
+        return ORJSONResponse(
+            ThreadHistoryResponse(
+                user_id=config.user_id,
+                thread_id=thread_id,
+                messages=messages
+            ).model_dump(mode="json")
         )
         
     except Exception as e:
@@ -478,17 +634,91 @@ async def get_conversation_history(
 
 
 @app.post("/chat/stream", tags=["Chat"])
-async def chat_stream(request: ChatRequest):
+async def chat_stream(
+    request: ChatRequest,
+    http_request: Request,
+    workflow: ModuleType = Depends(get_workflow),
+):
     """
     Stream a response from the CowNet AI system.
     
     This endpoint provides Server-Sent Events (SSE) for streaming responses.
-    Currently returns a placeholder - implement with async generator for full streaming.
+    Tokens of the response agent's answer are sent as `data: {"token": ...}`
+    frames as soon as they are generated; the stream ends with a
+    `data: {"done": true, ...}` frame that carries the full `final_response`
+    and the session identifiers. Answers that are not generated token by token
+    (chit-chat, cached responses) arrive as a single token frame.
+    
+    - **message**: The user's question or request
+    - **user_id**: Optional user identifier (auto-generated if not provided)
+    - **thread_id**: Optional thread identifier for conversation continuity
     """
-    # TODO: Implement streaming with async generator and SSE
-    raise HTTPException(
-        status_code=501,
-        detail="Streaming endpoint not yet implemented. Use /chat for synchronous responses."
+    config = workflow.CowNetCheckpointerConfig(
+        user_id=request.user_id,
+        thread_id=request.thread_id
+    )
+    messages = [HumanMessage(content=request.message)]
+    pool = http_request.app.state.pool
+    
+    async def event_generator():
+        final_response = ""
+        streamed = False
+        try:
+            # Chit-chat gets a canned reply; only record it in the thread history
+            intent = classify_trivial_intent(request.message)
+            if intent is not None:
+                final_response = _TRIVIAL_REPLIES[intent]
+                await workflow.record_exchange(
+                    messages + [AIMessage(content=final_response, name="response_agent")],
+                    config=config,
+                    pool=pool,
+                )
+            else:
+                async for event in workflow.stream_workflow_events(
+                    messages=messages, config=config, pool=pool
+                ):
+                    kind = event["event"]
+                    if kind == "on_chat_model_stream":
+                        # Only the response agent's tokens form the answer; the
+                        # other agents' LLM calls are intermediate work
+                        if event["metadata"].get("langgraph_node") != "response_agent":
+                            continue
+                        token = event["data"]["chunk"].content
+                        # Structured-output and tool-call chunks carry no text content
+                        if token and isinstance(token, str):
+                            streamed = True
+                            yield f"data: {json.dumps({'token': token})}\n\n"
+                    elif kind == "on_chain_end" and not event.get("parent_ids"):
+                        # The root run ends with the final graph state
+                        result = event["data"].get("output") or {}
+                        final_response = result.get("final_response") or ""
+                        if not final_response:
+                            response_messages = result.get("messages", [])
+                            if response_messages and isinstance(response_messages[-1], AIMessage):
+                                final_response = response_messages[-1].content
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            return
+        
+        if not final_response:
+            final_response = "I apologize, but I couldn't generate a response. Please try again."
+        if not streamed:
+            yield f"data: {json.dumps({'token': final_response})}\n\n"
+        
+        logger.info(f"Chat stream completed for user={config.user_id}, thread={config.thread_id}")
+        done = {
+            'done': True,
+            'final_response': final_response,
+            'user_id': config.user_id,
+            'thread_id': config.thread_id,
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -507,5 +737,5 @@ if __name__ == "__main__":
         host=host,
         port=port,
         reload=True,
-        log_level="info"
+        log_level="info",
     )
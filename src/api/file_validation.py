@@ -6,13 +6,32 @@ the required schema before being moved to the data directory.
 """
 
 import os
-import re
+import codecs
 import shutil
+import errno
+import re
+import csv
+import itertools
+import multiprocessing
+import time
+import numpy as np
 import pandas as pd
 from enum import Enum
-from typing import Tuple, Optional, List
+from typing import Callable, Iterable, Iterator, Tuple, Optional, List
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+
+from diskcache import Cache
+
+# pyarrow is optional; it gives a multi-threaded CSV parser, a streaming
+# reader for large files and columnar string kernels for the checks below
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
 
 
 class FileType(str, Enum):
@@ -22,7 +41,7 @@ class FileType(str, Enum):
     PEN_ASSIGNMENT = "pen_assignment"
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of file validation."""
     is_valid: bool
@@ -40,14 +59,41 @@ class ValidationResult:
         }
 
 
+# On-disk cache of validation results keyed by (content digest, file type),
+# so re-uploading an identical file skips the pandas parse and schema scan
+VALIDATION_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'validation')
+VALIDATION_CACHE_TTL = 24 * 60 * 60
+# Bumped whenever the pickled ValidationResult layout or the verdicts change
+VALIDATION_CACHE_VERSION = 3
+_validation_cache = Cache(VALIDATION_CACHE_DIR)
+
+
+def get_cached_validation(digest: str, file_type: FileType) -> Optional[ValidationResult]:
+    """Return the cached validation result for a file digest, if any."""
+    return _validation_cache.get(f"v{VALIDATION_CACHE_VERSION}:{digest}:{file_type.value}")
+
+
+def cache_validation(digest: str, file_type: FileType, result: ValidationResult) -> None:
+    """Store a validation result for a file digest."""
+    _validation_cache.set(
+        f"v{VALIDATION_CACHE_VERSION}:{digest}:{file_type.value}",
+        result,
+        expire=VALIDATION_CACHE_TTL
+    )
+
+
+# Compiled once at import and shared by the scalar and column-wise checks
+_UUID_RE = re.compile(
+    r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
+)
+_WEEK_RE = re.compile(r'^\d{4}-W(0[1-9]|[1-4][0-9]|5[0-3])$')
+
+
 def is_valid_uuid(value) -> bool:
     """Check if a value is a valid UUID string."""
     if pd.isna(value):
         return False
-    uuid_pattern = re.compile(
-        r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'
-    )
-    return bool(uuid_pattern.match(str(value)))
+    return bool(_UUID_RE.match(str(value)))
 
 
 def is_valid_int(value) -> bool:
@@ -96,8 +142,7 @@ def is_valid_iso8601_week(value) -> bool:
     """
     if pd.isna(value):
         return False
-    pattern = re.compile(r'^\d{4}-W(0[1-9]|[1-4][0-9]|5[0-3])$')
-    return bool(pattern.match(str(value)))
+    return bool(_WEEK_RE.match(str(value)))
 
 
 def is_valid_string(value) -> bool:
@@ -107,6 +152,221 @@ def is_valid_string(value) -> bool:
     return isinstance(value, str) and len(str(value).strip()) > 0
 
 
+# ============================================================================
+# Vectorized column checks
+# ============================================================================
+
+_INT_STR_RE = re.compile(r'^\s*[+-]?\d+\s*$')
+# One alternation so cow_id text columns take a single regex pass, not two
+_UUID_OR_INT_RE = re.compile(f'(?:{_UUID_RE.pattern})|(?:{_INT_STR_RE.pattern})')
+_MAX_UNIX_TIMESTAMP = 4102444800
+
+
+def _int_mask(series: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `is_valid_int`."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.notna()
+    return series.notna() & series.astype(str).str.match(_INT_STR_RE)
+
+
+def _uuid_or_int_mask(series: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `is_valid_uuid_or_int`."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.notna()
+    return series.notna() & series.astype(str).str.match(_UUID_OR_INT_RE)
+
+
+def _to_float_array(series: pd.Series) -> np.ndarray:
+    """Coerce a column to float64, with NaN for missing or non-numeric cells."""
+    if _HAS_PYARROW and series.dtype != object and pd.api.types.is_string_dtype(series):
+        # Arrow's string -> double cast is an order of magnitude faster than
+        # to_numeric, but fails outright on any cell that is not a plain number
+        try:
+            return pc.cast(pa.array(series), pa.float64()).to_numpy(zero_copy_only=False)
+        except pa.ArrowInvalid:
+            pass
+    # Arrow-backed columns keep NaN and null apart; NumPy folds both into NaN
+    return pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _float_mask(series: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `is_valid_float`."""
+    return pd.Series(~np.isnan(_to_float_array(series)), index=series.index)
+
+
+def _unix_timestamp_mask(series: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `is_valid_unix_timestamp`."""
+    ts = _to_float_array(series)
+    with np.errstate(invalid='ignore'):
+        valid = (ts >= 0) & (ts <= _MAX_UNIX_TIMESTAMP)
+    return pd.Series(valid, index=series.index)
+
+
+def _string_mask(series: pd.Series) -> pd.Series:
+    """
+    Column-wise equivalent of `is_valid_string`.
+    
+    Label columns such as lactation_stage hold a handful of distinct values,
+    so each distinct value is checked once and the verdicts are broadcast back
+    through the factorized codes.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.Series(False, index=series.index)
+    codes, uniques = pd.factorize(series)
+    valid_uniques = pd.Series(uniques).astype(str).str.strip().str.len().to_numpy() > 0
+    # Missing values get code -1, which picks the trailing False
+    return pd.Series(np.append(valid_uniques, False)[codes], index=series.index)
+
+
+def _week_bytes_valid(arr: "pa.LargeStringArray") -> np.ndarray:
+    """Match `_WEEK_RE` over the raw UTF-8 bytes of an Arrow string array."""
+    _, offsets_buf, data_buf = arr.buffers()
+    offsets = np.frombuffer(offsets_buf, dtype=np.int64)[arr.offset:arr.offset + len(arr) + 1]
+    starts = offsets[:-1]
+    # YYYY-Www is exactly 8 bytes; only those rows are looked at further
+    valid = (offsets[1:] - starts) == 8
+    rows = np.flatnonzero(valid)
+    if len(rows):
+        raw = np.frombuffer(data_buf, dtype=np.uint8)[starts[rows, None] + np.arange(8)]
+        # uint8 wraparound sends bytes below '0' past 9, so one compare finds digits
+        digits = raw - np.uint8(ord('0'))
+        is_digit = digits <= 9
+        week = digits[:, 6].astype(np.int16) * 10 + digits[:, 7]
+        valid[rows] = (
+            is_digit[:, :4].all(axis=1)
+            & (raw[:, 4] == ord('-')) & (raw[:, 5] == ord('W'))
+            & is_digit[:, 6] & is_digit[:, 7]
+            & (week >= 1) & (week <= 53)
+        )
+    if arr.null_count:
+        valid &= ~arr.is_null().to_numpy(zero_copy_only=False)
+    return valid
+
+
+def _iso8601_week_mask(series: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `is_valid_iso8601_week`."""
+    if _HAS_PYARROW and not pd.api.types.is_numeric_dtype(series):
+        try:
+            arr = pa.array(series, from_pandas=True)
+            if isinstance(arr, pa.ChunkedArray):
+                arr = arr.combine_chunks()
+            arr = pc.cast(arr, pa.large_string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed Python objects; leave them to the regex
+            pass
+        else:
+            return pd.Series(_week_bytes_valid(arr), index=series.index)
+    return series.notna() & series.astype(str).str.match(_WEEK_RE)
+
+
+# Masks whose verdict on a cell depends on whether read_csv typed the column
+# as numbers or as text; the float and timestamp checks parse either way
+_DTYPE_SENSITIVE_MASKS = frozenset({_int_mask, _uuid_or_int_mask, _string_mask})
+
+
+# Error messages list this many invalid rows, plus "..." when there are more
+_MAX_REPORTED_ROWS = 10
+
+
+def _invalid_rows(valid_mask: pd.Series) -> List:
+    """
+    Row indices where a validity mask is False.
+    
+    Returns at most one more than `_format_rows` shows, which is enough to
+    know whether to add "...", so bad files never build an O(N) list.
+    """
+    positions = np.flatnonzero(~valid_mask.to_numpy(dtype=bool))[:_MAX_REPORTED_ROWS + 1]
+    return valid_mask.index[positions].tolist()
+
+
+def _format_rows(rows: List) -> str:
+    """Format invalid row indices for an error message (first 10 only)."""
+    suffix = '...' if len(rows) > _MAX_REPORTED_ROWS else ''
+    return f"{rows[:_MAX_REPORTED_ROWS]}{suffix}"
+
+
+def _read_csv(file_path: str) -> pd.DataFrame:
+    """Read a CSV with the Arrow parser and Arrow-backed columns when available."""
+    if _HAS_PYARROW:
+        try:
+            return pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+        except pd.errors.ParserError as e:
+            # The Arrow parser reports an empty file as a generic parse error
+            if "Empty CSV file" in str(e):
+                raise pd.errors.EmptyDataError(str(e)) from e
+            raise
+    return pd.read_csv(file_path)
+
+
+# Files above this size are validated in chunks so peak memory stays bounded;
+# smaller files are parsed in one pass by _read_csv. Chunks are read as text
+# so a cell's verdict does not depend on which other rows happened to land in
+# the same chunk (see _validate_frames).
+CSV_STREAM_THRESHOLD = 64 * 1024 * 1024
+CSV_CHUNK_ROWS = 200_000
+CSV_ARROW_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _read_arrow_text_chunks(file_path: str) -> Iterator[pd.DataFrame]:
+    """Stream a CSV as Arrow-backed string columns, one record batch at a time."""
+    # Only the header is read with the csv module, to pin every column to text
+    with open(file_path, newline='', encoding='utf-8') as f:
+        header = next(csv.reader(f), [])
+    try:
+        reader = pa_csv.open_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(block_size=CSV_ARROW_BLOCK_SIZE),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=dict.fromkeys(header, pa.string()),
+                strings_can_be_null=True
+            )
+        )
+        start = 0
+        for batch in reader:
+            chunk = batch.to_pandas(types_mapper=pd.ArrowDtype)
+            # Number rows across batches the way read_csv(chunksize=...) does
+            chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+    except pa.ArrowInvalid as e:
+        raise pd.errors.ParserError(str(e)) from e
+
+
+def _read_csv_chunks(file_path: str, text_chunks: bool) -> Iterator[pd.DataFrame]:
+    """Yield the non-empty row chunks of a CSV file."""
+    if not text_chunks:
+        chunks = [_read_csv(file_path)]
+    elif _HAS_PYARROW:
+        chunks = _read_arrow_text_chunks(file_path)
+    else:
+        chunks = pd.read_csv(file_path, chunksize=CSV_CHUNK_ROWS, engine='c', dtype=str)
+    for chunk in chunks:
+        if not chunk.empty:
+            yield chunk
+
+
+# Bytes inspected before parsing to reject files that are not text at all
+CSV_SNIFF_BYTES = 64 * 1024
+
+
+def _sniff_text(file_path: str) -> str:
+    """
+    Check that a file starts like UTF-8 text, before handing it to the parser.
+    
+    Returns an error message, or "" when the head of the file looks like text.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(CSV_SNIFF_BYTES)
+    if b'\x00' in head:
+        return "File appears to be binary, not CSV"
+    try:
+        # Not final: the read may have cut a multi-byte character in half
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+    except UnicodeDecodeError:
+        return "File is not UTF-8 encoded text"
+    return ""
+
+
 def validate_csv_file(file_path: str) -> Tuple[bool, Optional[pd.DataFrame], str]:
     """
     Validate that a file is a valid CSV.
@@ -120,8 +380,12 @@ def validate_csv_file(file_path: str) -> Tuple[bool, Optional[pd.DataFrame], str
     if not os.path.exists(file_path):
         return False, None, f"File not found: {file_path}"
     
+    sniff_error = _sniff_text(file_path)
+    if sniff_error:
+        return False, None, sniff_error
+    
     try:
-        df = pd.read_csv(file_path)
+        df = _read_csv(file_path)
         if df.empty:
             return False, None, "CSV file is empty"
         return True, df, ""
@@ -133,70 +397,263 @@ def validate_csv_file(file_path: str) -> Tuple[bool, Optional[pd.DataFrame], str
         return False, None, f"Error reading CSV: {str(e)}"
 
 
-def validate_cow_location(df: pd.DataFrame) -> ValidationResult:
+@dataclass(frozen=True, slots=True)
+class _Schema:
+    """Required columns, per-column checks and duplicate key for a file type."""
+    required_columns: Tuple[str, ...]
+    checks: Tuple[Tuple[str, Callable[[pd.Series], pd.Series], str], ...]
+    duplicate_key: Tuple[str, ...]
+    duplicate_warning: str
+
+
+_WEEK_ID_ERROR = "Invalid week_id values (expected ISO-8601 format YYYY-Www) at rows"
+
+_SCHEMAS = {
+    FileType.COW_LOCATION: _Schema(
+        required_columns=('cow_id', 'timestamp', 'x_coor', 'y_coor', 'z_coor'),
+        checks=(
+            ('cow_id', _uuid_or_int_mask, "Invalid cow_id values at rows"),
+            ('timestamp', _unix_timestamp_mask, "Invalid timestamp values at rows"),
+            ('x_coor', _float_mask, "Invalid x_coor values at rows"),
+            ('y_coor', _float_mask, "Invalid y_coor values at rows"),
+            ('z_coor', _float_mask, "Invalid z_coor values at rows"),
+        ),
+        duplicate_key=('cow_id', 'timestamp'),
+        duplicate_warning="Duplicate cow_id + timestamp combinations detected",
+    ),
+    FileType.COW_REGISTRY: _Schema(
+        required_columns=('cow_id', 'parity', 'lactation_stage', 'week_id'),
+        checks=(
+            ('cow_id', _uuid_or_int_mask, "Invalid cow_id values at rows"),
+            ('parity', _int_mask, "Invalid parity values at rows"),
+            ('lactation_stage', _string_mask, "Invalid lactation_stage values at rows"),
+            ('week_id', _iso8601_week_mask, _WEEK_ID_ERROR),
+        ),
+        duplicate_key=('cow_id', 'week_id'),
+        duplicate_warning="Duplicate cow_id + week_id combinations detected",
+    ),
+    FileType.PEN_ASSIGNMENT: _Schema(
+        required_columns=('cow_id', 'pen_id', 'week_id'),
+        checks=(
+            ('cow_id', _uuid_or_int_mask, "Invalid cow_id values at rows"),
+            ('pen_id', _int_mask, "Invalid pen_id values at rows"),
+            ('week_id', _iso8601_week_mask, _WEEK_ID_ERROR),
+        ),
+        duplicate_key=('cow_id', 'week_id'),
+        duplicate_warning="Duplicate cow_id + week_id combinations detected - cow may be assigned to multiple pens",
+    ),
+}
+
+
+# Column checks are independent, so a chunk's checks run side by side; the
+# NumPy/Arrow kernels behind the masks release the GIL for much of the work.
+# Inside a validation pool worker (the API runs one process per CPU) a single
+# check thread is used, so checks only overlap the duplicate-key hashing
+# instead of oversubscribing the cores the pool already spans.
+_CHECK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=(
+        1 if multiprocessing.parent_process() is not None
+        else min(8, os.cpu_count() or 1)
+    ),
+    thread_name_prefix="csv-check"
+)
+
+
+def _run_check(
+    column: pd.Series,
+    mask: Callable[[pd.Series], pd.Series],
+    judge_as_numbers: bool
+) -> Tuple[List, Optional[List]]:
     """
-    Validate cow location file schema.
+    Invalid rows of one column chunk (only as many as `_format_rows` shows).
     
-    Required columns (datatype):
-    - cow_id (uuid/int)
-    - timestamp (UNIX)
-    - x_coor (float)
-    - y_coor (float)
-    - z_coor (float)
+    With `judge_as_numbers`, also returns the invalid rows of the column parsed
+    as numbers, or None when some non-empty cell is not numeric.
     """
-    errors = []
-    warnings = []
+    invalid_rows = _invalid_rows(mask(column))
+    if not judge_as_numbers:
+        return invalid_rows, None
+    as_numbers = pd.Series(_to_float_array(column), index=column.index)
+    if as_numbers.count() != column.count():
+        return invalid_rows, None
+    return invalid_rows, _invalid_rows(mask(as_numbers))
+
+
+def _collect_invalid(rows: List, new_rows: List) -> None:
+    """Append invalid row indices to `rows`, keeping only what `_format_rows` shows."""
+    if len(rows) <= _MAX_REPORTED_ROWS:
+        rows.extend(new_rows[:_MAX_REPORTED_ROWS + 1 - len(rows)])
+
+
+def _merge_key_hashes(seen: np.ndarray, keys: pd.DataFrame) -> Optional[np.ndarray]:
+    """
+    Merge a chunk's row-key hashes into the sorted array of hashes seen so far.
     
-    required_columns = ['cow_id', 'timestamp', 'x_coor', 'y_coor', 'z_coor']
+    Returns None as soon as a key repeats, within the chunk or against an
+    earlier one. A sorted uint64 array costs 8 bytes per distinct key, where
+    a Python set of the same hashes would cost several times that.
+    """
+    hashes = np.sort(pd.util.hash_pandas_object(keys, index=False, categorize=False).to_numpy())
+    if (hashes[1:] == hashes[:-1]).any():
+        return None
+    if len(seen):
+        positions = np.minimum(np.searchsorted(seen, hashes), len(seen) - 1)
+        if (seen[positions] == hashes).any():
+            return None
+    # Two sorted runs: the stable sort merges them in linear time
+    return np.sort(np.concatenate([seen, hashes]), kind='stable')
+
+
+class _DuplicateKeyTracker:
+    """
+    Track whether any row key repeats across a sequence of row chunks.
+    
+    Text chunks hold unparsed strings, but a single read_csv pass compares a
+    key column as numbers when every non-empty cell in it is numeric (so
+    `7` and `007`, or `1.7e9` and `1700000000`, are the same key). Whether a
+    column is all-numeric is only known at the end of the file, so hashes are
+    kept for every numeric/text reading of the key columns that is still
+    possible, and the one matching the final column types decides.
+    """
     
-    # Check for required columns
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        errors.append(f"Missing required columns: {', '.join(missing_columns)}")
-        return ValidationResult(
-            is_valid=False,
-            file_type=FileType.COW_LOCATION,
-            errors=errors,
-            warnings=warnings
-        )
+    def __init__(self, key_columns: Tuple[str, ...], text_chunks: bool):
+        self._key_columns = list(key_columns)
+        self._numeric_columns = set(key_columns) if text_chunks else set()
+        # Sorted hashes per set of key columns read as numbers; None once a
+        # key has repeated under that reading
+        self._seen = {
+            frozenset(numeric): np.empty(0, dtype=np.uint64)
+            for n in range(len(self._numeric_columns) + 1)
+            for numeric in itertools.combinations(sorted(self._numeric_columns), n)
+        }
     
-    # Validate cow_id (uuid or int)
-    invalid_cow_ids = []
-    for idx, val in df['cow_id'].items():
-        if not is_valid_uuid_or_int(val):
-            invalid_cow_ids.append(idx)
-    if invalid_cow_ids:
-        errors.append(f"Invalid cow_id values at rows: {invalid_cow_ids[:10]}{'...' if len(invalid_cow_ids) > 10 else ''}")
-    
-    # Validate timestamp (UNIX)
-    invalid_timestamps = []
-    for idx, val in df['timestamp'].items():
-        if not is_valid_unix_timestamp(val):
-            invalid_timestamps.append(idx)
-    if invalid_timestamps:
-        errors.append(f"Invalid timestamp values at rows: {invalid_timestamps[:10]}{'...' if len(invalid_timestamps) > 10 else ''}")
-    
-    # Validate coordinates (float)
-    for coord in ['x_coor', 'y_coor', 'z_coor']:
-        invalid_coords = []
-        for idx, val in df[coord].items():
-            if not is_valid_float(val):
-                invalid_coords.append(idx)
-        if invalid_coords:
-            errors.append(f"Invalid {coord} values at rows: {invalid_coords[:10]}{'...' if len(invalid_coords) > 10 else ''}")
+    @property
+    def has_duplicates(self) -> bool:
+        """Whether a key repeated, comparing columns the way read_csv would type them."""
+        return self._seen[frozenset(self._numeric_columns)] is None
+    
+    def update(self, df: pd.DataFrame) -> None:
+        """Merge a chunk's row keys into every reading still possible."""
+        # A later chunk can still turn a column to text, so stop only once
+        # every remaining reading has seen a repeat
+        if all(seen is None for seen in self._seen.values()):
+            return
+        
+        as_numbers = {}
+        for column in list(self._numeric_columns):
+            values = _to_float_array(df[column])
+            if np.count_nonzero(~np.isnan(values)) == df[column].count():
+                as_numbers[column] = values
+            else:
+                # A non-numeric cell keeps this column as text for good
+                self._numeric_columns.discard(column)
+                self._seen = {
+                    numeric: seen for numeric, seen in self._seen.items()
+                    if column not in numeric
+                }
+        
+        for numeric, seen in self._seen.items():
+            if seen is None:
+                continue
+            keys = pd.DataFrame({
+                column: as_numbers[column] if column in numeric else df[column]
+                for column in self._key_columns
+            })
+            self._seen[numeric] = _merge_key_hashes(seen, keys)
+
+
+def _validate_frames(
+    frames: Iterable[pd.DataFrame],
+    file_type: FileType,
+    text_chunks: bool = False
+) -> ValidationResult:
+    """
+    Validate a file given as a sequence of row chunks.
+    
+    Invalid rows are collected per check across chunks (only as many as the
+    error message shows), and duplicate keys are tracked as sorted row
+    hashes (see `_merge_key_hashes`) so duplicates spanning two chunks are
+    still detected; tracking stops at the first duplicate. With
+    `text_chunks`, key columns are compared as numbers when they turn out
+    to be all-numeric (see `_DuplicateKeyTracker`).
+    
+    With `text_chunks`, the frames hold unparsed strings. Columns checked by a
+    mask in `_DTYPE_SENSITIVE_MASKS` are then also judged as numbers, and those
+    results are reported when every non-empty cell of the column was numeric,
+    matching how a single read_csv pass would have typed it.
+    """
+    schema = _SCHEMAS[file_type]
+    errors = []
+    warnings = []
+    invalid = {message: [] for _, _, message in schema.checks}
+    invalid_as_numbers = {message: [] for _, _, message in schema.checks}
+    numeric_columns = {
+        column for column, mask, _ in schema.checks
+        if text_chunks and mask in _DTYPE_SENSITIVE_MASKS
+    }
+    duplicate_keys = _DuplicateKeyTracker(schema.duplicate_key, text_chunks)
+    
+    for i, df in enumerate(frames):
+        # Check for required columns
+        if i == 0:
+            missing_columns = [col for col in schema.required_columns if col not in df.columns]
+            if missing_columns:
+                errors.append(f"Missing required columns: {', '.join(missing_columns)}")
+                return ValidationResult(
+                    is_valid=False,
+                    file_type=file_type,
+                    errors=errors,
+                    warnings=warnings
+                )
+        
+        futures = [
+            _CHECK_EXECUTOR.submit(_run_check, df[column], mask, column in numeric_columns)
+            for column, mask, _ in schema.checks
+        ]
+        
+        # Duplicate keys are hashed here while the column checks run
+        duplicate_keys.update(df)
+        
+        for (column, _, message), future in zip(schema.checks, futures):
+            rows, rows_as_numbers = future.result()
+            _collect_invalid(invalid[message], rows)
+            if column in numeric_columns:
+                if rows_as_numbers is None:
+                    numeric_columns.discard(column)
+                else:
+                    _collect_invalid(invalid_as_numbers[message], rows_as_numbers)
+    
+    for column, _, message in schema.checks:
+        rows = invalid_as_numbers[message] if column in numeric_columns else invalid[message]
+        if rows:
+            errors.append(f"{message}: {_format_rows(rows)}")
     
     # Add warnings for potential issues
-    if df.duplicated(subset=['cow_id', 'timestamp']).any():
-        warnings.append("Duplicate cow_id + timestamp combinations detected")
+    if duplicate_keys.has_duplicates:
+        warnings.append(schema.duplicate_warning)
     
     return ValidationResult(
         is_valid=len(errors) == 0,
-        file_type=FileType.COW_LOCATION,
+        file_type=file_type,
         errors=errors,
         warnings=warnings
     )
 
 
+def validate_cow_location(df: pd.DataFrame) -> ValidationResult:
+    """
+    Validate cow location file schema.
+    
+    Required columns (datatype):
+    - cow_id (uuid/int)
+    - timestamp (UNIX)
+    - x_coor (float)
+    - y_coor (float)
+    - z_coor (float)
+    """
+    return _validate_frames([df], FileType.COW_LOCATION)
+
+
 def validate_cow_registry(df: pd.DataFrame) -> ValidationResult:
     """
     Validate cow registry file schema.
@@ -207,64 +664,7 @@ def validate_cow_registry(df: pd.DataFrame) -> ValidationResult:
     - lactation_stage (string)
     - week_id (ISO-8601)
     """
-    errors = []
-    warnings = []
-    
-    required_columns = ['cow_id', 'parity', 'lactation_stage', 'week_id']
-    
-    # Check for required columns
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        errors.append(f"Missing required columns: {', '.join(missing_columns)}")
-        return ValidationResult(
-            is_valid=False,
-            file_type=FileType.COW_REGISTRY,
-            errors=errors,
-            warnings=warnings
-        )
-    
-    # Validate cow_id (uuid or int)
-    invalid_cow_ids = []
-    for idx, val in df['cow_id'].items():
-        if not is_valid_uuid_or_int(val):
-            invalid_cow_ids.append(idx)
-    if invalid_cow_ids:
-        errors.append(f"Invalid cow_id values at rows: {invalid_cow_ids[:10]}{'...' if len(invalid_cow_ids) > 10 else ''}")
-    
-    # Validate parity (int)
-    invalid_parity = []
-    for idx, val in df['parity'].items():
-        if not is_valid_int(val):
-            invalid_parity.append(idx)
-    if invalid_parity:
-        errors.append(f"Invalid parity values at rows: {invalid_parity[:10]}{'...' if len(invalid_parity) > 10 else ''}")
-    
-    # Validate lactation_stage (string)
-    invalid_lactation = []
-    for idx, val in df['lactation_stage'].items():
-        if not is_valid_string(val):
-            invalid_lactation.append(idx)
-    if invalid_lactation:
-        errors.append(f"Invalid lactation_stage values at rows: {invalid_lactation[:10]}{'...' if len(invalid_lactation) > 10 else ''}")
-    
-    # Validate week_id (ISO-8601)
-    invalid_weeks = []
-    for idx, val in df['week_id'].items():
-        if not is_valid_iso8601_week(val):
-            invalid_weeks.append(idx)
-    if invalid_weeks:
-        errors.append(f"Invalid week_id values (expected ISO-8601 format YYYY-Www) at rows: {invalid_weeks[:10]}{'...' if len(invalid_weeks) > 10 else ''}")
-    
-    # Add warnings for potential issues
-    if df.duplicated(subset=['cow_id', 'week_id']).any():
-        warnings.append("Duplicate cow_id + week_id combinations detected")
-    
-    return ValidationResult(
-        is_valid=len(errors) == 0,
-        file_type=FileType.COW_REGISTRY,
-        errors=errors,
-        warnings=warnings
-    )
+    return _validate_frames([df], FileType.COW_REGISTRY)
 
 
 def validate_pen_assignment(df: pd.DataFrame) -> ValidationResult:
@@ -276,62 +676,16 @@ def validate_pen_assignment(df: pd.DataFrame) -> ValidationResult:
     - pen_id (int)
     - week_id (ISO-8601)
     """
-    errors = []
-    warnings = []
-    
-    required_columns = ['cow_id', 'pen_id', 'week_id']
-    
-    # Check for required columns
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        errors.append(f"Missing required columns: {', '.join(missing_columns)}")
-        return ValidationResult(
-            is_valid=False,
-            file_type=FileType.PEN_ASSIGNMENT,
-            errors=errors,
-            warnings=warnings
-        )
-    
-    # Validate cow_id (uuid or int)
-    invalid_cow_ids = []
-    for idx, val in df['cow_id'].items():
-        if not is_valid_uuid_or_int(val):
-            invalid_cow_ids.append(idx)
-    if invalid_cow_ids:
-        errors.append(f"Invalid cow_id values at rows: {invalid_cow_ids[:10]}{'...' if len(invalid_cow_ids) > 10 else ''}")
-    
-    # Validate pen_id (int)
-    invalid_pen_ids = []
-    for idx, val in df['pen_id'].items():
-        if not is_valid_int(val):
-            invalid_pen_ids.append(idx)
-    if invalid_pen_ids:
-        errors.append(f"Invalid pen_id values at rows: {invalid_pen_ids[:10]}{'...' if len(invalid_pen_ids) > 10 else ''}")
-    
-    # Validate week_id (ISO-8601)
-    invalid_weeks = []
-    for idx, val in df['week_id'].items():
-        if not is_valid_iso8601_week(val):
-            invalid_weeks.append(idx)
-    if invalid_weeks:
-        errors.append(f"Invalid week_id values (expected ISO-8601 format YYYY-Www) at rows: {invalid_weeks[:10]}{'...' if len(invalid_weeks) > 10 else ''}")
-    
-    # Add warnings for potential issues
-    if df.duplicated(subset=['cow_id', 'week_id']).any():
-        warnings.append("Duplicate cow_id + week_id combinations detected - cow may be assigned to multiple pens")
-    
-    return ValidationResult(
-        is_valid=len(errors) == 0,
-        file_type=FileType.PEN_ASSIGNMENT,
-        errors=errors,
-        warnings=warnings
-    )
+    return _validate_frames([df], FileType.PEN_ASSIGNMENT)
 
 
 def validate_file(file_path: str, file_type: FileType) -> ValidationResult:
     """
     Main validation function that validates a file based on its type.
     
+    The CSV is parsed and checked chunk by chunk (see `_read_csv_chunks`),
+    so large uploads never have to fit in memory as a single DataFrame.
+    
     Args:
         file_path: Path to the file to validate
         file_type: Type of file to validate
@@ -339,9 +693,7 @@ def validate_file(file_path: str, file_type: FileType) -> ValidationResult:
     Returns:
         ValidationResult containing validation status and any errors/warnings
     """
-    # First validate it's a valid CSV
-    is_valid_csv, df, error_msg = validate_csv_file(file_path)
-    if not is_valid_csv:
+    def invalid(error_msg: str) -> ValidationResult:
         return ValidationResult(
             is_valid=False,
             file_type=file_type,
@@ -349,23 +701,60 @@ def validate_file(file_path: str, file_type: FileType) -> ValidationResult:
             warnings=[]
         )
     
-    # Validate based on file type
-    validators = {
-        FileType.COW_LOCATION: validate_cow_location,
-        FileType.COW_REGISTRY: validate_cow_registry,
-        FileType.PEN_ASSIGNMENT: validate_pen_assignment
-    }
+    # First validate it's a valid CSV
+    if not file_path.lower().endswith('.csv'):
+        return invalid("File must have .csv extension")
     
-    validator = validators.get(file_type)
-    if not validator:
-        return ValidationResult(
-            is_valid=False,
-            file_type=file_type,
-            errors=[f"Unknown file type: {file_type}"],
-            warnings=[]
-        )
+    if not os.path.exists(file_path):
+        return invalid(f"File not found: {file_path}")
     
-    return validator(df)
+    if file_type not in _SCHEMAS:
+        return invalid(f"Unknown file type: {file_type}")
+    
+    sniff_error = _sniff_text(file_path)
+    if sniff_error:
+        return invalid(sniff_error)
+    
+    try:
+        text_chunks = os.path.getsize(file_path) > CSV_STREAM_THRESHOLD
+        frames = _read_csv_chunks(file_path, text_chunks)
+        first = next(frames, None)
+        if first is None:
+            return invalid("CSV file is empty")
+        return _validate_frames(itertools.chain([first], frames), file_type, text_chunks)
+    except pd.errors.EmptyDataError:
+        return invalid("CSV file is empty or has no valid data")
+    except pd.errors.ParserError as e:
+        return invalid(f"Invalid CSV format: {str(e)}")
+    except Exception as e:
+        return invalid(f"Error reading CSV: {str(e)}")
+
+
+def _move_file(source_path: str, destination_path: str) -> None:
+    """
+    Move a file, renaming in place when source and destination share a filesystem.
+    
+    Across filesystems (e.g. a tmpfs upload dir and a persistent data dir) the
+    bytes are copied with shutil.copyfile (which uses the platform's fast copy
+    path) into a sibling temp file, which is then renamed over the destination
+    so readers never see a partial CSV.
+    """
+    try:
+        os.replace(source_path, destination_path)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    
+    partial_path = f"{destination_path}.part"
+    try:
+        shutil.copyfile(source_path, partial_path)
+        os.replace(partial_path, destination_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.unlink(source_path)
 
 
 def move_validated_file(
@@ -388,16 +777,14 @@ def move_validated_file(
         # Create destination directory if it doesn't exist
         os.makedirs(destination_dir, exist_ok=True)
         
-        # Generate destination filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        original_name = os.path.basename(source_path)
-        name_without_ext = os.path.splitext(original_name)[0]
-        new_filename = f"{file_type.value}_{timestamp}.csv"
+        # Generate destination filename from the nanosecond clock: unique even
+        # for uploads landing in the same second, and still sorts by time
+        new_filename = f"{file_type.value}_{time.time_ns():x}.csv"
         
         destination_path = os.path.join(destination_dir, new_filename)
         
         # Move the file
-        shutil.move(source_path, destination_path)
+        _move_file(source_path, destination_path)
         
         return True, destination_path, ""
         
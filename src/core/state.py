@@ -10,12 +10,20 @@ class GraphState(TypedDict):
     
     messages: Annotated[Sequence[BaseMessage], add_messages]
     
+    user_query: Optional[str]
+    
+    final_response: Optional[str]
+    
     interactions: Optional[dict]
+    # Content hash of `interactions`, set when they are loaded
+    interactions_key: Optional[str]
     
     sna_graph: Optional[dict]
     sna_metrics: Optional[dict]
+    sna_key: Optional[str]
     
     research: Optional[str]
     
-    simulation_graph: Optional[dict]
-    simulation_metrics: Optional[dict]
\ No newline at end of file
+    simulation_metrics: Optional[dict]
+    
+    last_memory_query: Optional[str]
\ No newline at end of file
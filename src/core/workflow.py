@@ -1,13 +1,17 @@
 import os
 import uuid
-from typing import Optional
-from contextlib import asynccontextmanager
+import asyncio
+import functools
+from typing import AsyncIterator, Optional
+from contextlib import asynccontextmanager, nullcontext
 
 from langgraph.graph import StateGraph, END
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langgraph.types import Command
 from langchain_core.messages import HumanMessage
+from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
 from core.state import GraphState
@@ -74,54 +78,166 @@ def _get_postgres_connection_string() -> str:
 
 # Global connection pool for async checkpointer
 _connection_pool: Optional[AsyncConnectionPool] = None
+_connection_pool_lock = asyncio.Lock()
 
+# Pool bounds for the checkpointer (the PGVECTOR_POOL_* variables size mem0's pool)
+CHECKPOINT_POOL_MIN = int(os.getenv("CHECKPOINT_POOL_MIN", "4"))
+CHECKPOINT_POOL_MAX = int(os.getenv("CHECKPOINT_POOL_MAX", "32"))
+# Seconds before a pooled connection is closed and replaced
+CHECKPOINT_POOL_RECYCLE = float(os.getenv("CHECKPOINT_POOL_RECYCLE", "1800"))
 
-async def get_connection_pool() -> AsyncConnectionPool:
-    """Get or create the async connection pool."""
+
+async def init_connection_pool(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+) -> AsyncConnectionPool:
+    """
+    Create and open the shared async connection pool once.
+    
+    Called at application startup; later calls return the existing pool.
+    
+    Args:
+        min_size: Connections kept open at all times. Defaults to CHECKPOINT_POOL_MIN
+        max_size: Upper bound on concurrently borrowed connections.
+                  Defaults to CHECKPOINT_POOL_MAX
+    
+    Returns:
+        The shared AsyncConnectionPool
+    """
     global _connection_pool
     if _connection_pool is None:
-        connection_string = _get_postgres_connection_string()
-        _connection_pool = AsyncConnectionPool(
-            conninfo=connection_string,
-            max_size=10,
-            min_size=1,
-        )
-        await _connection_pool.open()
-        logger.info("Created async PostgreSQL connection pool for checkpointer")
+        async with _connection_pool_lock:
+            if _connection_pool is None:
+                pool = AsyncConnectionPool(
+                    conninfo=_get_postgres_connection_string(),
+                    max_size=max_size or CHECKPOINT_POOL_MAX,
+                    min_size=min_size or CHECKPOINT_POOL_MIN,
+                    # Recycle connections before server or firewall limits
+                    # drop them, shrink back to min_size after idle spells,
+                    # and fail a borrow instead of waiting forever
+                    max_lifetime=CHECKPOINT_POOL_RECYCLE,
+                    max_idle=300.0,
+                    timeout=30.0,
+                    open=False,
+                    # Connection settings AsyncPostgresSaver expects: its setup
+                    # migrations cannot run inside a transaction, it reads rows
+                    # as dicts, and server-side prepared statements break behind
+                    # transaction-pooling proxies such as PgBouncer.
+                    # TCP keepalives detect half-open connections during long
+                    # SNA runs instead of waiting for the OS default of hours.
+                    kwargs={
+                        "autocommit": True,
+                        "prepare_threshold": 0,
+                        "row_factory": dict_row,
+                        "keepalives": 1,
+                        "keepalives_idle": 30,
+                        "keepalives_interval": 10,
+                    },
+                )
+                await pool.open()
+                _connection_pool = pool
+                logger.info("Created async PostgreSQL connection pool for checkpointer")
     return _connection_pool
 
 
+async def get_connection_pool() -> AsyncConnectionPool:
+    """Get the shared async connection pool, creating it on first use."""
+    return await init_connection_pool()
+
+
+async def keep_connection_pool_alive(interval: float = 60.0):
+    """
+    Periodically ping the database so idle pooled connections are not dropped.
+    
+    Runs until cancelled.
+    
+    Args:
+        interval: Seconds between pings
+    """
+    while True:
+        await asyncio.sleep(interval)
+        if _connection_pool is None:
+            continue
+        try:
+            async with _connection_pool.connection() as conn:
+                await conn.execute("SELECT 1")
+        except Exception as e:
+            logger.warning(f"Connection pool keep-alive failed: {e}")
+
+
 async def close_connection_pool():
     """Close the connection pool gracefully."""
-    global _connection_pool
+    global _connection_pool, _checkpointer, _compiled_graph
+    # The cached checkpointer and graph are bound to this pool
+    _checkpointer = None
+    _compiled_graph = None
     if _connection_pool is not None:
         await _connection_pool.close()
         _connection_pool = None
         logger.info("Closed async PostgreSQL connection pool")
 
 
+class PooledAsyncPostgresSaver(AsyncPostgresSaver):
+    """
+    AsyncPostgresSaver that lets concurrent calls run on separate pooled connections.
+    
+    The base saver holds one asyncio lock around every cursor so that a single
+    connection is never used by two coroutines at once. When backed by a pool
+    each call borrows its own connection, so that lock only serializes
+    unrelated threads behind one another.
+    """
+
+    def __init__(self, conn, serde=None):
+        super().__init__(conn, serde=serde)
+        if isinstance(conn, AsyncConnectionPool):
+            self.lock = nullcontext()
+
+
+# Checkpointer shared by the compiled graph and the history endpoints
+_checkpointer: Optional[AsyncPostgresSaver] = None
+_checkpointer_lock = asyncio.Lock()
+
+
+async def get_checkpointer(pool: Optional[AsyncConnectionPool] = None) -> AsyncPostgresSaver:
+    """
+    Get the shared PostgreSQL checkpointer, creating its tables once.
+    
+    Args:
+        pool: Connection pool to borrow from, used on first creation.
+              Defaults to the shared pool.
+    
+    Returns:
+        The shared AsyncPostgresSaver
+    """
+    global _checkpointer
+    if _checkpointer is None:
+        async with _checkpointer_lock:
+            if _checkpointer is None:
+                checkpointer = PooledAsyncPostgresSaver(pool or await get_connection_pool())
+                # Setup the checkpointer tables if they don't exist
+                await checkpointer.setup()
+                _checkpointer = checkpointer
+    return _checkpointer
+
+
 @asynccontextmanager
-async def get_async_checkpointer():
+async def get_async_checkpointer(pool: Optional[AsyncConnectionPool] = None):
     """
     Async context manager for PostgreSQL checkpointer.
     
+    Args:
+        pool: Connection pool to borrow from. Defaults to the shared pool.
+    
     Yields:
-        AsyncPostgresSaver: Configured async checkpointer instance
+        AsyncPostgresSaver: The shared checkpointer (see `get_checkpointer`)
     """
-    pool = await get_connection_pool()
-    checkpointer = AsyncPostgresSaver(pool)
-    
-    # Setup the checkpointer tables if they don't exist
-    await checkpointer.setup()
-    
-    try:
-        yield checkpointer
-    finally:
-        # Pool is managed globally, not closed here
-        pass
+    # Pool and checkpointer are managed globally, not closed here
+    yield await get_checkpointer(pool)
 
 
-# Build the multi-agent graph
+# Build the multi-agent graph. The topology never changes at runtime, so it
+# is built once per process; compiling does not modify the builder.
+@functools.cache
 def build_cownet_workflow():
     graph = StateGraph(GraphState)
 
@@ -159,6 +275,12 @@ def compile_graph_with_memory_saver():
     return build_cownet_workflow().compile(checkpointer=memory_saver)
 
 
+@functools.lru_cache(maxsize=8)
+def _compile_for(checkpointer: BaseCheckpointSaver):
+    """Compile the workflow for a caller-supplied checkpointer, once per instance."""
+    return build_cownet_workflow().compile(checkpointer=checkpointer)
+
+
 async def compile_graph_with_postgres_checkpointer():
     """
     Compile graph with async PostgreSQL checkpointer for production use.
@@ -166,14 +288,65 @@ async def compile_graph_with_postgres_checkpointer():
     Returns:
         Compiled graph with AsyncPostgresSaver checkpointer
     """
-    async with get_async_checkpointer() as checkpointer:
-        compiled_graph = build_cownet_workflow().compile(checkpointer=checkpointer)
-        return compiled_graph
+    return await get_compiled_graph()
+
+
+# Workflow compiled once with the Postgres checkpointer and shared by all requests
+_compiled_graph = None
+_compiled_graph_lock = asyncio.Lock()
+
+
+async def get_compiled_graph(pool: Optional[AsyncConnectionPool] = None):
+    """
+    Get the workflow compiled with the PostgreSQL checkpointer, compiling it once.
+    
+    Args:
+        pool: Connection pool for the checkpointer, used on first compilation.
+              Defaults to the shared pool.
+    
+    Returns:
+        The shared compiled graph
+    """
+    global _compiled_graph
+    if _compiled_graph is None:
+        async with _compiled_graph_lock:
+            if _compiled_graph is None:
+                checkpointer = await get_checkpointer(pool)
+                _compiled_graph = build_cownet_workflow().compile(checkpointer=checkpointer)
+                logger.info("Compiled CowNet workflow with PostgreSQL checkpointer")
+    return _compiled_graph
+
+
+# When checkpoints are persisted during a run: "async" (LangGraph's default)
+# writes each step while the next one runs, "sync" waits for every write,
+# and "exit" writes once when the run finishes, trading per-step resume and
+# history for a single batch of inserts per turn
+CHECKPOINT_DURABILITY = os.getenv("CHECKPOINT_DURABILITY", "async")
+if CHECKPOINT_DURABILITY not in ("sync", "async", "exit"):
+    raise ValueError(
+        f"CHECKPOINT_DURABILITY must be 'sync', 'async' or 'exit', got {CHECKPOINT_DURABILITY!r}"
+    )
+
+
+def _initial_state(messages: list) -> dict:
+    """Build the workflow input for a new user turn."""
+    # Record the user query once so nodes need not scan message history, and
+    # clear the previous turn's answer from the checkpointed state
+    return {
+        "messages": messages,
+        "final_response": None,
+        "user_query": next(
+            (m.content for m in messages if isinstance(m, HumanMessage)),
+            None,
+        ),
+    }
 
 
 async def run_workflow_async(
     messages: list,
     config: Optional[CowNetCheckpointerConfig] = None,
+    pool: Optional[AsyncConnectionPool] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
 ):
     """
     Run the CowNet workflow asynchronously with PostgreSQL checkpointing.
@@ -182,6 +355,10 @@ async def run_workflow_async(
         messages: List of messages to process
         config: Checkpointer configuration with user_id and thread_id.
                 If not provided, creates new config with auto-generated IDs.
+        pool: Connection pool for the checkpointer, used if the graph is not
+              compiled yet. Defaults to the shared pool.
+        checkpointer: Checkpointer to run with instead of the shared
+                      PostgreSQL one (e.g. a MemorySaver in development).
     
     Returns:
         The final state from the workflow execution
@@ -189,24 +366,88 @@ async def run_workflow_async(
     if config is None:
         config = CowNetCheckpointerConfig()
     
-    async with get_async_checkpointer() as checkpointer:
-        compiled_graph = build_cownet_workflow().compile(checkpointer=checkpointer)
-        
-        initial_state = {
-            "messages": messages,
-        }
-        
-        result = await compiled_graph.ainvoke(
-            initial_state,
-            config=config.config
-        )
-        
-        logger.info(
-            f"Workflow completed for user_id={config.user_id}, "
-            f"thread_id={config.thread_id}"
-        )
-        
-        return result
+    if checkpointer is not None:
+        compiled_graph = _compile_for(checkpointer)
+    else:
+        compiled_graph = await get_compiled_graph(pool)
+    
+    result = await compiled_graph.ainvoke(
+        _initial_state(messages),
+        config=config.config,
+        durability=CHECKPOINT_DURABILITY,
+    )
+    
+    logger.info(
+        f"Workflow completed for user_id={config.user_id}, "
+        f"thread_id={config.thread_id}"
+    )
+    
+    return result
+
+
+async def stream_workflow_events(
+    messages: list,
+    config: Optional[CowNetCheckpointerConfig] = None,
+    pool: Optional[AsyncConnectionPool] = None,
+) -> AsyncIterator[dict]:
+    """
+    Run the CowNet workflow and yield its LangGraph v2 stream events.
+    
+    Args:
+        messages: List of messages to process
+        config: Checkpointer configuration with user_id and thread_id.
+                If not provided, creates new config with auto-generated IDs.
+        pool: Connection pool for the checkpointer, used if the graph is not
+              compiled yet. Defaults to the shared pool.
+    
+    Yields:
+        Events from `astream_events(..., version="v2")` as they are produced
+    """
+    if config is None:
+        config = CowNetCheckpointerConfig()
+    
+    compiled_graph = await get_compiled_graph(pool)
+    
+    async for event in compiled_graph.astream_events(
+        _initial_state(messages),
+        config=config.config,
+        version="v2",
+        durability=CHECKPOINT_DURABILITY,
+    ):
+        yield event
+    
+    logger.info(
+        f"Streamed workflow completed for user_id={config.user_id}, "
+        f"thread_id={config.thread_id}"
+    )
+
+
+async def record_exchange(
+    messages: list,
+    config: CowNetCheckpointerConfig,
+    pool: Optional[AsyncConnectionPool] = None,
+):
+    """
+    Append an already-answered exchange to a thread without running the agents.
+    
+    Used for turns answered outside the graph so the thread history stays
+    consistent.
+    
+    Args:
+        messages: The user message followed by the answer AIMessage
+        config: Checkpointer configuration with user_id and thread_id
+        pool: Connection pool for the checkpointer, used if the graph is not
+              compiled yet. Defaults to the shared pool.
+    """
+    compiled_graph = await get_compiled_graph(pool)
+    await compiled_graph.aupdate_state(
+        config.config,
+        {
+            **_initial_state(messages),
+            "final_response": messages[-1].content,
+        },
+        as_node="response_agent",
+    )
 
 
 async def get_thread_history(
@@ -221,13 +462,41 @@ async def get_thread_history(
     Returns:
         List of state checkpoints for the thread
     """
-    async with get_async_checkpointer() as checkpointer:
-        history = []
-        async for checkpoint in checkpointer.alist(config.config):
-            history.append(checkpoint)
-        return history
+    checkpointer = await get_checkpointer()
+    return [checkpoint async for checkpoint in checkpointer.alist(config.config)]
+
+
+async def get_latest_checkpoint(
+    config: CowNetCheckpointerConfig,
+) -> Optional[dict]:
+    """
+    Retrieve the newest checkpoint for a specific thread.
+    
+    Checkpoints are cumulative snapshots, so the latest one already holds the
+    full conversation.
+    
+    Args:
+        config: Checkpointer configuration with thread_id
+    
+    Returns:
+        The latest checkpoint (with `channel_values`), or None for an unknown thread
+    """
+    checkpointer = await get_checkpointer()
+    checkpoint_tuple = await checkpointer.aget_tuple(config.config)
+    return checkpoint_tuple.checkpoint if checkpoint_tuple else None
+
+
+@functools.lru_cache(maxsize=1)
+def get_graph():
+    """
+    Get the workflow compiled without a checkpointer, compiling it once.
+    
+    Returns:
+        The shared compiled graph
+    """
+    return build_cownet_workflow().compile()
 
 
-# Default compiled graph (with in-memory saver for backward compatibility)
-graph = build_cownet_workflow().compile()
+# Default compiled graph (without checkpointer, for backward compatibility)
+graph = get_graph()
 
@@ -1,10 +1,34 @@
+from functools import lru_cache
 from typing import Type
 
+import httpx
 from langchain_openai import ChatOpenAI
 
 from .base import BaseProvider
 
 
+@lru_cache(maxsize=1)
+def get_shared_http_async_client() -> httpx.AsyncClient:
+    """
+    Process-wide async HTTP client for OpenAI calls.
+
+    Shared by every ChatOpenAI instance so TLS handshakes happen once per
+    worker and concurrent agent calls are multiplexed over HTTP/2.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
+
+
+async def close_shared_http_async_client() -> None:
+    """Close the shared async HTTP client, if it was created."""
+    if get_shared_http_async_client.cache_info().currsize:
+        await get_shared_http_async_client().aclose()
+        get_shared_http_async_client.cache_clear()
+
+
 class OpenAIProvider(BaseProvider):
     """Provider for OpenAI models."""
 
@@ -1,26 +1,74 @@
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterator
 import os
 import re
+import string
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
-from langchain.tools import tool
+from langchain_core.tools import StructuredTool
 
 # ReportLab for PDF generation
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Flowable
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 
+# Classifies a line in one match: group 1 holds the heading marks, otherwise
+# a match is a bullet. Numbered items render as plain paragraphs, so they
+# need no pattern of their own.
+_LINE_PREFIX_RE = re.compile(r"(#{1,3}) |[-*]\s")
+
+# Styles never change after construction, so they are built once at import
+_STYLES = getSampleStyleSheet()
+
+_HEADING1 = ParagraphStyle(
+	"Heading1Custom",
+	parent=_STYLES["Heading1"],
+	fontSize=18,
+	spaceAfter=12,
+)
+_HEADING2 = ParagraphStyle(
+	"Heading2Custom",
+	parent=_STYLES["Heading2"],
+	fontSize=16,
+	spaceAfter=8,
+)
+_HEADING3 = ParagraphStyle(
+	"Heading3Custom",
+	parent=_STYLES["Heading3"],
+	fontSize=14,
+	spaceAfter=6,
+)
+_TITLE = ParagraphStyle(
+	"DocTitle",
+	parent=_STYLES["Heading1"],
+	fontSize=18,
+	spaceAfter=12,
+	alignment=1,
+)
+
+
+class _FilenameTable(dict):
+	"""str.translate table; characters missing from it (non-ASCII) become "_"."""
+
+	def __missing__(self, code: int) -> str:
+		return "_"
+
+
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "_.-")
+_FILENAME_TABLE = _FilenameTable(
+	(code, chr(code) if chr(code) in _SAFE_FILENAME_CHARS else "_") for code in range(128)
+)
+
 
 def _sanitize_filename(name: str) -> str:
 	"""Sanitize a filename to avoid invalid characters on Windows."""
-	name = name.strip()
-	name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
-	return name or "report.pdf"
+	return name.strip().translate(_FILENAME_TABLE) or "report.pdf"
 
 
-def _markdown_to_flowables(markdown: str) -> list:
-	"""Convert a small subset of Markdown into ReportLab flowables.
+def _markdown_to_flowables(markdown: str) -> Iterator[Flowable]:
+	"""Convert a small subset of Markdown into ReportLab flowables, lazily.
 
 	Supported:
 	- # Heading 1, ## Heading 2, ### Heading 3
@@ -28,74 +76,33 @@ def _markdown_to_flowables(markdown: str) -> list:
 	- Numbered lines like "1. Item"
 	- Regular paragraphs
 	"""
-	styles = getSampleStyleSheet()
+	headings = (None, _HEADING1, _HEADING2, _HEADING3)
+	bullet = _STYLES["Bullet"]
+	normal = _STYLES["Normal"]
 
-	heading1 = ParagraphStyle(
-		"Heading1Custom",
-		parent=styles["Heading1"],
-		fontSize=18,
-		spaceAfter=12,
-	)
-	heading2 = ParagraphStyle(
-		"Heading2Custom",
-		parent=styles["Heading2"],
-		fontSize=16,
-		spaceAfter=8,
-	)
-	heading3 = ParagraphStyle(
-		"Heading3Custom",
-		parent=styles["Heading3"],
-		fontSize=14,
-		spaceAfter=6,
-	)
-
-	bullet = styles["Bullet"]
-	normal = styles["Normal"]
-
-	flow = []
 	for raw_line in markdown.splitlines():
 		line = raw_line.strip()
 		if not line:
 			continue
 
-		if line.startswith("# "):
-			flow.append(Paragraph(line[2:], heading1))
-		elif line.startswith("## "):
-			flow.append(Paragraph(line[3:], heading2))
-		elif line.startswith("### "):
-			flow.append(Paragraph(line[4:], heading3))
-		elif re.match(r"^[-*]\s+", line):
-			flow.append(Paragraph(line[2:], bullet))
-		elif re.match(r"^\d+\.\s+", line):
-			# Simple numbered item rendered as normal paragraph
-			flow.append(Paragraph(line, normal))
+		prefix = _LINE_PREFIX_RE.match(line)
+		if prefix is None:
+			yield Paragraph(line, normal)
+		elif prefix.group(1):
+			yield Paragraph(line[prefix.end():], headings[len(prefix.group(1))])
 		else:
-			flow.append(Paragraph(line, normal))
+			yield Paragraph(line[2:], bullet)
 
-		flow.append(Spacer(1, 6))
+		yield Spacer(1, 6)
 
-	return flow
 
+# Bounds how many PDFs async callers render at once; layout holds the GIL,
+# so more threads would only interleave builds without finishing them sooner
+_PDF_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf")
 
-@tool("markdown_to_pdf", response_format="content_and_artifact")
-def markdown_to_pdf(markdown: str, filename: Optional[str] = None, title: Optional[str] = "CowNet Report") -> Tuple[str, Dict[str, Any]]:
-	"""
-	Convert Markdown-like text to a PDF and save it to disk.
-
-	Args:
-		markdown: The Markdown content to render.
-		filename: Optional filename (e.g., "cownet_report.pdf"). If not provided, a timestamped name is generated.
-		title: Optional document title to place at the top.
 
-	Returns:
-		A tuple of (content, artifact) suitable for LangChain tools with response_format="content_and_artifact":
-		- content: Short summary string of the operation
-		- artifact: {"path": full_file_path, "filename": basename}
-
-	Notes:
-		- Creates a "reports" directory under the current working directory if it does not exist.
-		- Uses ReportLab; ensure `reportlab` is installed.
-	"""
+def _prepare_pdf(markdown: str, filename: Optional[str], title: Optional[str]) -> Tuple[str, SimpleDocTemplate, list]:
+	"""Resolve the output path and lay out the flowables for a report."""
 	reports_dir = os.path.join(os.getcwd(), "reports")
 	os.makedirs(reports_dir, exist_ok=True)
 
@@ -106,7 +113,6 @@ def markdown_to_pdf(markdown: str, filename: Optional[str] = None, title: Option
 	filename = _sanitize_filename(filename)
 	filepath = os.path.join(reports_dir, filename)
 
-	# Build the PDF
 	doc = SimpleDocTemplate(
 		filepath,
 		pagesize=letter,
@@ -116,23 +122,18 @@ def markdown_to_pdf(markdown: str, filename: Optional[str] = None, title: Option
 		bottomMargin=0.75 * inch,
 	)
 
-	styles = getSampleStyleSheet()
-	title_style = ParagraphStyle(
-		"DocTitle",
-		parent=styles["Heading1"],
-		fontSize=18,
-		spaceAfter=12,
-		alignment=1,
-	)
-
 	story = []
 	if title:
-		story.append(Paragraph(title, title_style))
-		story.append(Paragraph(datetime.now().strftime("Generated %B %d, %Y %I:%M %p"), styles["Normal"]))
+		story.append(Paragraph(title, _TITLE))
+		story.append(Paragraph(datetime.now().strftime("Generated %B %d, %Y %I:%M %p"), _STYLES["Normal"]))
 		story.append(Spacer(1, 18))
 
 	story.extend(_markdown_to_flowables(markdown))
+	return filepath, doc, story
+
 
+def _build_pdf(filepath: str, doc: SimpleDocTemplate, story: list) -> Tuple[str, Dict[str, Any]]:
+	"""Render and write the PDF, returning the tool's (content, artifact) pair."""
 	try:
 		doc.build(story)
 		content = f"PDF generated: {os.path.basename(filepath)} saved to {filepath}"
@@ -141,3 +142,44 @@ def markdown_to_pdf(markdown: str, filename: Optional[str] = None, title: Option
 	except Exception as e:
 		return f"Failed to generate PDF: {e}", {}
 
+
+def _markdown_to_pdf(markdown: str, filename: Optional[str] = None, title: Optional[str] = "CowNet Report") -> Tuple[str, Dict[str, Any]]:
+	"""
+	Convert Markdown-like text to a PDF and save it to disk.
+
+	Args:
+		markdown: The Markdown content to render.
+		filename: Optional filename (e.g., "cownet_report.pdf"). If not provided, a timestamped name is generated.
+		title: Optional document title to place at the top.
+
+	Returns:
+		A tuple of (content, artifact) suitable for LangChain tools with response_format="content_and_artifact":
+		- content: Short summary string of the operation
+		- artifact: {"path": full_file_path, "filename": basename}
+
+	Notes:
+		- Creates a "reports" directory under the current working directory if it does not exist.
+		- Uses ReportLab; ensure `reportlab` is installed.
+	"""
+	return _build_pdf(*_prepare_pdf(markdown, filename, title))
+
+
+async def markdown_to_pdf_async(markdown: str, filename: Optional[str] = None, title: Optional[str] = "CowNet Report") -> Tuple[str, Dict[str, Any]]:
+	"""Async variant of `markdown_to_pdf` for callers on the event loop.
+
+	Flowables are laid out on the loop; only the blocking page rendering and
+	file write run on the bounded PDF executor.
+	"""
+	filepath, doc, story = _prepare_pdf(markdown, filename, title)
+	return await asyncio.get_running_loop().run_in_executor(
+		_PDF_EXECUTOR, _build_pdf, filepath, doc, story
+	)
+
+
+# Async agents call the coroutine, so their PDF builds share the bounded executor
+markdown_to_pdf = StructuredTool.from_function(
+	func=_markdown_to_pdf,
+	coroutine=markdown_to_pdf_async,
+	name="markdown_to_pdf",
+	response_format="content_and_artifact",
+)
@@ -1,11 +1,49 @@
-from typing import Dict, Any, Tuple, Annotated
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Annotated
 from langgraph.prebuilt import InjectedState
 from langchain.tools import tool
 import networkx as nx
 from .sna_tools import get_demo_sna_results
 
-@tool
-def remove_cow_from_network(cow_id: str):
+# Bounded LRU of removal results keyed by (cow_id, baseline graph hash). A
+# removal is deterministic, so retries and repeat questions about the same
+# cow skip recomputing the metrics; a new baseline graph gets a new hash.
+# Tool calls run concurrently on worker threads, hence the lock.
+_REMOVAL_CACHE: "OrderedDict[Tuple[str, str], Tuple[str, Dict[str, Any]]]" = OrderedDict()
+_REMOVAL_CACHE_MAX_SIZE = 32
+_REMOVAL_CACHE_LOCK = threading.Lock()
+
+
+def _graph_key(sna_graph: dict) -> str:
+    """Content hash of a dict-of-dicts graph."""
+    return hashlib.blake2b(pickle.dumps(sna_graph), digest_size=16).hexdigest()
+
+
+def _removal_cache_get(key: Tuple[str, str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Look up a cached removal result and mark it as recently used."""
+    with _REMOVAL_CACHE_LOCK:
+        cached = _REMOVAL_CACHE.get(key)
+        if cached is not None:
+            _REMOVAL_CACHE.move_to_end(key)
+        return cached
+
+
+def _removal_cache_put(key: Tuple[str, str], result: Tuple[str, Dict[str, Any]]) -> None:
+    """Store a removal result, evicting the least recently used entry when full."""
+    with _REMOVAL_CACHE_LOCK:
+        _REMOVAL_CACHE[key] = result
+        _REMOVAL_CACHE.move_to_end(key)
+        if len(_REMOVAL_CACHE) > _REMOVAL_CACHE_MAX_SIZE:
+            _REMOVAL_CACHE.popitem(last=False)
+
+@tool(response_format="content_and_artifact")
+def remove_cow_from_network(
+    cow_id: str,
+    sna_graph: Annotated[dict, InjectedState("sna_graph")],
+) -> Tuple[str, Dict[str, Any]]:
     """
     Remove a single cow from the social network graph and return the modified graph.
 
@@ -21,8 +59,9 @@ def remove_cow_from_network(cow_id: str):
         cow_id: The cow ID (string) to remove from the network.
 
     """
-    return cow_id
-    
+    return _remove_cow_from_network(cow_id=cow_id, sna_graph=sna_graph)
+
+
 def _remove_cow_from_network(
     cow_id: str,
     sna_graph: dict
@@ -50,21 +89,29 @@ def _remove_cow_from_network(
         )
         return content, {}
 
-    # Rebuild graph from dict representation
-    G_base = nx.from_dict_of_dicts(sna_graph)
-    
     # Check if cow exists in graph
-    if cow_id not in G_base.nodes:
+    neighbors = sna_graph.get(cow_id)
+    if neighbors is None:
         content = (
             f"Cow {cow_id} is not present in the current social network graph. "
-            f"Available cows: {len(G_base.nodes)} total nodes."
+            f"Available cows: {len(sna_graph)} total nodes."
         )
         return content, {}
 
-    # Create modified graph (copy + remove node)
-    G_modified = G_base.copy()
-    original_degree = G_modified.degree(cow_id)
-    G_modified.remove_node(cow_id)
+    cache_key = (cow_id, _graph_key(sna_graph))
+    cached = _removal_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Drop the cow and its edges directly on the dict representation; a
+    # self-loop counts twice towards the degree, as in NetworkX
+    original_degree = len(neighbors) + (cow_id in neighbors)
+    modified_graph_dict = {
+        node: {nb: data for nb, data in nbrs.items() if nb != cow_id}
+        for node, nbrs in sna_graph.items()
+        if node != cow_id
+    }
+    G_modified = nx.from_dict_of_dicts(modified_graph_dict)
     
     # Compute changes
     nodes_removed = 1
@@ -78,11 +125,16 @@ def _remove_cow_from_network(
         f"(↓{edges_removed})."
     )
     
-    # Serialize modified graph for state
-    modified_graph_dict = nx.to_dict_of_dicts(G_modified)
-    
     modified_metrics_dict = get_demo_sna_results(G_modified)
     
-
-    return (content, {"modified_graph": modified_graph_dict, "modified_metrics": modified_metrics_dict})
+    result = (
+        content,
+        {
+            "cow_id": cow_id,
+            "modified_graph": modified_graph_dict,
+            "modified_metrics": modified_metrics_dict,
+        },
+    )
+    _removal_cache_put(cache_key, result)
+    return result
 
@@ -3,56 +3,123 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import os
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from scipy import stats
+from scipy.sparse import csgraph
 import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 
-def create_social_network_graph(interaction_counts: pd.DataFrame) -> dict:
+try:
+    import igraph as ig
+    _HAS_IGRAPH = True
+except ImportError:  # pragma: no cover - NetworkX fallback
+    _HAS_IGRAPH = False
+
+try:
+    import numba
+    _HAS_NUMBA = True
+except ImportError:  # pragma: no cover - NumPy fallback
+    _HAS_NUMBA = False
+
+def build_social_network_graph(interaction_counts: pd.DataFrame) -> nx.Graph:
     """
-    Create NetworkX graph from interaction counts with inverse distance weights.
+    Build the NetworkX graph from interaction counts with inverse distance weights.
     
     Args:
         interaction_counts: DataFrame with 'cow_i', 'cow_j', 'count' columns
         
     Returns:
-        (G, edge_lengths): Graph with 'distance' attributes, and edge_lengths dict
+        Graph with 'count' and 'distance' attributes on every edge
     """
     G = nx.Graph()
+    if interaction_counts.empty:
+        return G
     
-    # Add edges with interaction counts
-    for _, row in interaction_counts.iterrows():
-        cow1, cow2, count = row['cow_i'], row['cow_j'], row['count']
-        G.add_edge(cow1, cow2, count=count)
-    
-    # Calculate edge lengths inversely proportional to interaction count
-    max_count = interaction_counts['count'].max()
+    # Edge lengths inversely proportional to interaction count: more
+    # interactions = shorter edge
+    counts = interaction_counts['count'].to_numpy()
+    max_count = counts.max()
     min_length = 0.2
     max_length = 2.0
-    edge_lengths = {}
+    lengths = max_length - (counts - 1) / (max_count - 1 + 1e-9) * (max_length - min_length)
     
-    for _, row in interaction_counts.iterrows():
-        count = row['count']
-        # Inverse scaling: more interactions = shorter edge
-        length = max_length - (count - 1) / (max_count - 1 + 1e-9) * (max_length - min_length)
-        edge_lengths[(row['cow_i'], row['cow_j'])] = length
+    # Add all edges in one call; a pair listed in both orientations keeps
+    # the attributes of its last row
+    G.add_edges_from(
+        (cow1, cow2, {'count': count, 'distance': length})
+        for cow1, cow2, count, length in zip(
+            interaction_counts['cow_i'].to_numpy(),
+            interaction_counts['cow_j'].to_numpy(),
+            counts.tolist(),
+            lengths.tolist(),
+        )
+    )
     
-    # Set distance attributes on edges
-    for (u, v), length in edge_lengths.items():
-        G[u][v]['distance'] = length
+    return G
+
+
+def create_social_network_graph(interaction_counts: pd.DataFrame) -> dict:
+    """
+    Create the social network graph from interaction counts, as a dict-of-dicts.
     
-    return nx.to_dict_of_dicts(G)
+    Args:
+        interaction_counts: DataFrame with 'cow_i', 'cow_j', 'count' columns
+        
+    Returns:
+        nx.to_dict_of_dicts form of `build_social_network_graph`
+    """
+    return nx.to_dict_of_dicts(build_social_network_graph(interaction_counts))
 
 def sigmoid(x: float) -> float:
     """Sigmoid activation function."""
     return 1 / (1 + math.exp(-np.clip(x, -10, 10)))
 
 
+def _sigmoid_array(x: np.ndarray) -> np.ndarray:
+    """Element-wise `sigmoid` over an array."""
+    return 1 / (1 + np.exp(-np.clip(x, -10, 10)))
+
+
+if _HAS_NUMBA:
+    @numba.njit(fastmath=True, cache=True)
+    def _risk_kernel(btw, comm, deg_centrality, closeness, norm_degree, mean_norm_degree):
+        """
+        Fused single-pass version of the risk formulas in `compute_risk_arrays`.
+        
+        All array arguments are float64 and aligned per cow.
+        """
+        n = btw.shape[0]
+        conflict = np.empty(n)
+        isolation = np.empty(n)
+        for i in range(n):
+            b = min(max(btw[i], -10.0), 10.0)
+            c = min(max(comm[i], -10.0), 10.0)
+            low_deg = 1.0 - deg_centrality[i]
+            conflict[i] = min(1.0,
+                0.50 / (1.0 + math.exp(-b)) +
+                0.15 / (1.0 + math.exp(-c)) +
+                0.35 * low_deg
+            )
+            isolation[i] = min(1.0,
+                0.50 * low_deg +
+                0.30 * (1.0 - closeness[i]) +
+                0.20 * abs(norm_degree[i] - mean_norm_degree)
+            )
+        return conflict, isolation
+
+
 def robust_z_score(values: Dict[str, float]) -> Dict[str, float]:
     """Robust z-score normalization using median/IQR (herd-level)."""
     if not values:
         return {}
     
-    scores_array = np.array(list(values.values()))
+    return dict(zip(values.keys(), _robust_z_array(np.array(list(values.values())))))
+
+
+def _robust_z_array(scores_array: np.ndarray) -> np.ndarray:
+    """`robust_z_score` over a non-empty array of scores."""
     median = np.median(scores_array)
     q75 = np.percentile(scores_array, 75)
     q25 = np.percentile(scores_array, 25)
@@ -63,11 +130,87 @@ def robust_z_score(values: Dict[str, float]) -> Dict[str, float]:
         if iqr == 0:
             iqr = 1.0
     
-    normalized_scores = {}
-    for cow_id, score in values.items():
-        z_robust = (score - median) / (iqr / 1.35)
-        normalized_scores[cow_id] = z_robust
-    return normalized_scores
+    return (scores_array - median) / (iqr / 1.35)
+
+
+def _igraph_path_centralities(G: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Betweenness and closeness computed by igraph's C implementation, as
+    arrays aligned with the graph's node order.
+    
+    Values are rescaled to match nx.betweenness_centrality(normalized=True)
+    and nx.closeness_centrality (Wasserman-Faust scaling for disconnected graphs).
+    """
+    nodes = list(G.nodes())
+    n = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    g = ig.Graph(n=n, edges=[(index[u], index[v]) for u, v in G.edges()])
+    
+    # NetworkX counts each undirected pair twice before normalizing
+    scale = 2 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    betweenness = np.array(g.betweenness(directed=False)) * scale
+    
+    # igraph normalizes closeness over the reachable nodes only (NaN when
+    # nothing is reachable)
+    membership = np.array(g.connected_components().membership)
+    reachable = np.bincount(membership)[membership] - 1
+    closeness = np.where(
+        reachable > 0,
+        np.nan_to_num(np.array(g.closeness(normalized=True))) * reachable / max(n - 1, 1),
+        0.0,
+    )
+    return betweenness, closeness
+
+
+# Source rows per shortest_path call in `_csgraph_closeness`, bounding the
+# distance block to _CLOSENESS_BLOCK x N floats
+_CLOSENESS_BLOCK = 512
+
+
+def _csgraph_closeness(G: nx.Graph) -> np.ndarray:
+    """
+    Closeness centrality from SciPy's C breadth-first search, aligned with
+    the graph's node order.
+    
+    Matches nx.closeness_centrality, including its Wasserman-Faust scaling
+    for disconnected graphs.
+    """
+    n = G.number_of_nodes()
+    adjacency = nx.to_scipy_sparse_array(G, weight=None, format='csr')
+    
+    closeness = np.zeros(n)
+    for start in range(0, n, _CLOSENESS_BLOCK):
+        dist = csgraph.shortest_path(
+            adjacency,
+            directed=False,
+            unweighted=True,
+            indices=np.arange(start, min(start + _CLOSENESS_BLOCK, n)),
+        )
+        finite = np.isfinite(dist)
+        reachable = finite.sum(axis=1) - 1
+        totsp = np.where(finite, dist, 0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            block = reachable / totsp * (reachable / (n - 1 if n > 1 else 1))
+        closeness[start:start + len(block)] = np.where(totsp > 0, block, 0.0)
+    return closeness
+
+
+def path_centrality_arrays(G: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalized betweenness and closeness as float arrays indexed by the
+    position of each cow in G.nodes().
+    """
+    if len(G.nodes()) == 0:
+        return np.empty(0), np.empty(0)
+    
+    if _HAS_IGRAPH:
+        return _igraph_path_centralities(G)
+    
+    betweenness = nx.betweenness_centrality(G, normalized=True)
+    return (
+        np.fromiter(betweenness.values(), dtype=np.float64, count=len(betweenness)),
+        _csgraph_closeness(G),
+    )
 
 
 def compute_centralities(G: nx.Graph) -> Dict[str, Dict[str, float]]:
@@ -75,67 +218,141 @@ def compute_centralities(G: nx.Graph) -> Dict[str, Dict[str, float]]:
     if len(G.nodes()) == 0:
         return {'betweenness': {}, 'degree': {}, 'closeness': {}}
     
+    nodes = list(G.nodes())
+    betweenness, closeness = path_centrality_arrays(G)
     return {
-        'betweenness': nx.betweenness_centrality(G, normalized=True),
+        'betweenness': dict(zip(nodes, betweenness.tolist())),
         'degree': nx.degree_centrality(G),
-        'closeness': nx.closeness_centrality(G)
+        'closeness': dict(zip(nodes, closeness.tolist()))
     }
 
 
-def compute_community_disruption(G: nx.Graph, cow_id: str) -> float:
-    """Compute community disruption score for a specific cow."""
-    if cow_id not in G.nodes() or len(G.nodes()) < 3:
-        return 0.0
+def community_index(G: nx.Graph) -> Optional[Dict[str, int]]:
+    """
+    Map each cow to the index of its greedy-modularity community.
+    
+    Returns None when communities are not computed (fewer than 3 cows, or
+    community detection fails).
+    """
+    if len(G.nodes()) < 3:
+        return None
     
     try:
-        communities = list(nx.community.greedy_modularity_communities(G))
+        communities = nx.community.greedy_modularity_communities(G)
     except:
-        return 0.0
+        return None
     
-    # Find cow's community
-    cow_community = None
-    for i, comm in enumerate(communities):
-        if cow_id in comm:
-            cow_community = i
-            break
+    return {cow: i for i, comm in enumerate(communities) for cow in comm}
+
+
+def compute_community_disruption(
+    G: nx.Graph,
+    cow_id: str,
+    node_community: Optional[Dict[str, int]] = None,
+) -> float:
+    """
+    Compute community disruption score for a specific cow.
     
-    if cow_community is None:
+    Pass `node_community` from `community_index(G)` when scoring many cows,
+    so communities are detected once instead of per cow.
+    """
+    if cow_id not in G.nodes():
         return 0.0
     
+    if node_community is None:
+        node_community = community_index(G)
+        if node_community is None:
+            return 0.0
+    
     # Count cross-community neighbors
-    neighbors = list(G.neighbors(cow_id))
+    neighbors = G[cow_id]
     if not neighbors:
         return 0.0
     
-    cross_connections = sum(
-        1 for n in neighbors 
-        if any(n in comm for i, comm in enumerate(communities) if i != cow_community)
-    )
+    cow_community = node_community[cow_id]
+    cross_connections = sum(1 for n in neighbors if node_community[n] != cow_community)
     return cross_connections / len(neighbors)
 
 
-def compute_per_cow_sna_metrics(G: nx.Graph) -> Dict[str, Dict[str, float]]:
+@dataclass(frozen=True, slots=True)
+class PerCowMetrics:
+    """
+    Per-cow SNA metrics in columnar form: one array per metric, aligned
+    with `cow_ids` (graph node order).
+    """
+    cow_ids: List[str]
+    betweenness: np.ndarray
+    degree: np.ndarray  # Raw degree (not normalized)
+    closeness: np.ndarray
+    community_disruption: np.ndarray
+
+    def degree_centrality(self) -> np.ndarray:
+        """Degree centrality, as nx.degree_centrality computes it from the raw degree."""
+        n = len(self.cow_ids)
+        return self.degree / (n - 1) if n > 1 else np.ones(n)
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Row form: {cow_id: {'betweenness', 'degree', 'closeness', 'community_disruption'}}."""
+        return {
+            cow_id: {
+                'betweenness': betweenness,
+                'degree': degree,
+                'closeness': closeness,
+                'community_disruption': community_disruption,
+            }
+            for cow_id, betweenness, degree, closeness, community_disruption in zip(
+                self.cow_ids,
+                self.betweenness.tolist(),
+                self.degree.tolist(),
+                self.closeness.tolist(),
+                self.community_disruption.tolist(),
+            )
+        }
+
+
+def compute_per_cow_sna_metrics(G: nx.Graph) -> PerCowMetrics:
     """
     Compute comprehensive SNA metrics for each cow (node-level).
     
-    Returns: {cow_id: {'betweenness': float, 'degree': float, 'closeness': float, 
-                       'community_disruption': float, ...}}
+    Returns: PerCowMetrics with betweenness, raw degree, closeness and
+             community_disruption arrays; `.to_dict()` gives the row form.
     """
-    centralities = compute_centralities(G)
+    cow_ids = list(G.nodes())
+    betweenness, closeness = path_centrality_arrays(G)
+    # Communities are herd-wide, so detect them once for all cows
+    node_community = community_index(G)
     
-    # Compute additional metrics for each cow
-    metrics = {}
-    for cow_id in G.nodes():
-        metrics[cow_id] = {
-            **{k: v.get(cow_id, 0.0) for k, v in centralities.items()},
-            'community_disruption': compute_community_disruption(G, cow_id),
-            'degree': G.degree(cow_id),  # Raw degree (not normalized)
-        }
+    return PerCowMetrics(
+        cow_ids=cow_ids,
+        betweenness=betweenness,
+        degree=np.fromiter((d for _, d in G.degree(cow_ids)), dtype=np.int64, count=len(cow_ids)),
+        closeness=closeness,
+        community_disruption=np.fromiter(
+            (
+                compute_community_disruption(G, c, node_community) if node_community is not None else 0.0
+                for c in cow_ids
+            ),
+            dtype=np.float64,
+            count=len(cow_ids),
+        ),
+    )
+
+
+def _herd_diameter(G: nx.Graph) -> float:
+    """
+    Exact diameter of G, or inf when the herd is not connected.
     
-    return metrics
+    Uses bounded eccentricity sweeps (iFUB-style) instead of all-pairs BFS;
+    the first sweep already fails on a disconnected graph, so no separate
+    connectivity pass is needed.
+    """
+    try:
+        return nx.diameter(G, usebounds=True)
+    except nx.NetworkXError:
+        return float('inf')
 
 
-def compute_herd_level_metrics(G: nx.Graph, per_cow_metrics: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+def compute_herd_level_metrics(G: nx.Graph, per_cow_metrics: PerCowMetrics) -> Dict[str, float]:
     """
     Compute herd-level (aggregate) metrics.
     
@@ -144,69 +361,126 @@ def compute_herd_level_metrics(G: nx.Graph, per_cow_metrics: Dict[str, Dict[str,
     if len(G.nodes()) == 0:
         return {}
     
+    degree = per_cow_metrics.degree
+    
     # Basic network stats
     herd_metrics = {
         'num_cows': len(G.nodes()),
         'num_edges': G.number_of_edges(),
         'density': nx.density(G),
-        'avg_degree': sum(G.degree(n) for n in G.nodes()) / len(G.nodes()),
-        'diameter': nx.diameter(G) if nx.is_connected(G) else float('inf'),
+        'avg_degree': degree.sum().item() / len(degree),
+        'diameter': _herd_diameter(G),
     }
     
     # Aggregate centralities across herd
-    all_betweenness = {cow: m['betweenness'] for cow, m in per_cow_metrics.items()}
-    all_degree = {cow: m['degree'] for cow, m in per_cow_metrics.items()}
-    
     herd_metrics.update({
-        'avg_betweenness': np.mean(list(all_betweenness.values())),
-        'max_betweenness': max(all_betweenness.values()) if all_betweenness else 0,
-        'avg_degree_centrality': np.mean(list(all_degree.values())),
-        'max_degree': max(herd_metrics['avg_degree'], max(G.degree(n) for n in G.nodes())),
+        'avg_betweenness': per_cow_metrics.betweenness.mean(),
+        'max_betweenness': per_cow_metrics.betweenness.max().item(),
+        'avg_degree_centrality': per_cow_metrics.degree_centrality().mean(),
+        'max_degree': max(herd_metrics['avg_degree'], degree.max().item()),
     })
     
     return herd_metrics
 
 
-def compute_risk_scores(G: nx.Graph, per_cow_metrics: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+def compute_risk_arrays(per_cow_metrics: PerCowMetrics) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Conflict and isolation risk per cow, aligned with `per_cow_metrics.cow_ids`,
+    using the original weighted formula.
+    """
+    if not per_cow_metrics.cow_ids:
+        return np.empty(0), np.empty(0)
+    
+    # Normalize metrics using robust z-score
+    btw = _robust_z_array(per_cow_metrics.betweenness)
+    norm_degree = _robust_z_array(per_cow_metrics.degree)
+    comm_disrupt = per_cow_metrics.community_disruption
+    deg_centrality = per_cow_metrics.degree_centrality()
+    closeness = per_cow_metrics.closeness
+    mean_norm_degree = norm_degree.mean()
+    
+    if _HAS_NUMBA:
+        return _risk_kernel(
+            btw.astype(np.float64),
+            comm_disrupt.astype(np.float64),
+            deg_centrality.astype(np.float64),
+            closeness.astype(np.float64),
+            norm_degree.astype(np.float64),
+            float(mean_norm_degree),
+        )
+    
+    # Original weighted formulas (simplified - no temporal components)
+    conflict = (
+        0.50 * _sigmoid_array(btw) +
+        0.15 * _sigmoid_array(comm_disrupt) +
+        0.35 * (1 - deg_centrality)  # High centrality reduces conflict risk
+    )
+    isolation = (
+        0.50 * (1 - deg_centrality) +      # Low degree = isolation
+        0.30 * (1 - closeness) +           # Low closeness = isolation
+        0.20 * np.abs(norm_degree - mean_norm_degree)  # Degree deviation
+    )
+    
+    return np.minimum(1.0, conflict), np.minimum(1.0, isolation)
+
+
+def compute_risk_scores(G: nx.Graph, per_cow_metrics: PerCowMetrics) -> Dict[str, Dict[str, float]]:
     """
     Compute conflict and isolation risk scores for each cow using the original weighted formula.
     
     Returns: {cow_id: {'conflict_risk': float, 'isolation_risk': float}}
     """
-    # Normalize all metrics using robust z-score
-    norm_betweenness = robust_z_score({c: m['betweenness'] for c, m in per_cow_metrics.items()})
-    norm_degree = robust_z_score({c: m['degree'] for c, m in per_cow_metrics.items()})
-    
-    risk_scores = {}
-    for cow_id in G.nodes():
-        # Extract normalized components
-        btw = norm_betweenness.get(cow_id, 0)
-        degree = per_cow_metrics[cow_id]['degree']
-        comm_disrupt = per_cow_metrics[cow_id]['community_disruption']
-        deg_centrality = per_cow_metrics[cow_id]['degree']
-        closeness = per_cow_metrics[cow_id]['closeness']
-        
-        # Original weighted formulas (simplified - no temporal components)
-        conflict = (
-            0.50 * sigmoid(btw) +
-            0.15 * sigmoid(comm_disrupt) +
-            0.35 * (1 - deg_centrality)  # High centrality reduces conflict risk
-        )
-        isolation = (
-            0.50 * (1 - deg_centrality) +      # Low degree = isolation
-            0.30 * (1 - closeness) +           # Low closeness = isolation
-            0.20 * abs(degree - np.mean(list(norm_degree.values())))  # Degree deviation
-        )
-        
-        risk_scores[cow_id] = {
-            'conflict_risk': min(1.0, conflict),
-            'isolation_risk': min(1.0, isolation)
-        }
+    conflict, isolation = compute_risk_arrays(per_cow_metrics)
+    return {
+        cow_id: {'conflict_risk': c, 'isolation_risk': i}
+        for cow_id, c, i in zip(per_cow_metrics.cow_ids, conflict.tolist(), isolation.tolist())
+    }
+
+
+def top_k_indices(values: np.ndarray, k: int) -> List[int]:
+    """
+    Indices of the `k` largest values, highest first, in O(N).
+    
+    Ties keep their original order, as a stable descending sort would, so
+    the selection at the cut-off is deterministic.
+    """
+    k = min(k, len(values))
+    if k == 0:
+        return []
     
-    return risk_scores
+    threshold = np.partition(values, len(values) - k)[len(values) - k]
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[:k - len(above)]
+    candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -values[candidates]))].tolist()
 
 
 # ---------- Demo Usage ----------
+# Bounded LRU of get_demo_sna_results keyed by graph content, shared by the
+# SNA agent and the removal simulations so any graph seen before (e.g. the
+# same removal reached from a reloaded baseline) skips the recomputation.
+# Tool calls run concurrently on worker threads, hence the lock.
+_SNA_RESULTS_CACHE: "OrderedDict[Tuple[frozenset, frozenset], Dict[str, Any]]" = OrderedDict()
+_SNA_RESULTS_CACHE_MAX_SIZE = 32
+_SNA_RESULTS_CACHE_LOCK = threading.Lock()
+
+
+def graph_fingerprint(G: nx.Graph) -> Tuple[frozenset, frozenset]:
+    """
+    Order-independent fingerprint of a graph's nodes, edges and edge attributes.
+    
+    Two graphs with the same fingerprint yield the same metrics, so it is
+    used as a cache key; equality is checked on collisions, unlike a bare hash.
+    """
+    return (
+        frozenset(G.nodes),
+        frozenset(
+            (frozenset((u, v)), tuple(sorted(d.items())))
+            for u, v, d in G.edges(data=True)
+        ),
+    )
+
+
 def get_demo_sna_results(G: nx.Graph) -> Dict[str, Any]:
     """
     Main function for LangGraph agent tools - returns all metrics in LangGraph-friendly format.
@@ -219,21 +493,43 @@ def get_demo_sna_results(G: nx.Graph) -> Dict[str, Any]:
         'top_risk_cows': [{'cow_id': str, 'conflict_risk': float, 'isolation_risk': float}, ...]
     }
     """
+    key = graph_fingerprint(G)
+    with _SNA_RESULTS_CACHE_LOCK:
+        cached = _SNA_RESULTS_CACHE.get(key)
+        if cached is not None:
+            _SNA_RESULTS_CACHE.move_to_end(key)
+            return cached
+    
+    results = _compute_demo_sna_results(G)
+    with _SNA_RESULTS_CACHE_LOCK:
+        _SNA_RESULTS_CACHE[key] = results
+        _SNA_RESULTS_CACHE.move_to_end(key)
+        if len(_SNA_RESULTS_CACHE) > _SNA_RESULTS_CACHE_MAX_SIZE:
+            _SNA_RESULTS_CACHE.popitem(last=False)
+    return results
+
+
+def _compute_demo_sna_results(G: nx.Graph) -> Dict[str, Any]:
+    """Compute the get_demo_sna_results payload for G without caching."""
     per_cow_metrics = compute_per_cow_sna_metrics(G)
     herd_metrics = compute_herd_level_metrics(G, per_cow_metrics)
-    risk_scores = compute_risk_scores(G, per_cow_metrics)
+    conflict, isolation = compute_risk_arrays(per_cow_metrics)
+    cow_ids = per_cow_metrics.cow_ids
+    risk_scores = {
+        cow_id: {'conflict_risk': c, 'isolation_risk': i}
+        for cow_id, c, i in zip(cow_ids, conflict.tolist(), isolation.tolist())
+    }
     
     # Top risk cows for quick agent access
-    top_risks = sorted(
-        risk_scores.items(),
-        key=lambda x: max(x[1]['conflict_risk'], x[1]['isolation_risk']),
-        reverse=True
-    )[:5]
+    top_risks = [
+        (cow_ids[i], risk_scores[cow_ids[i]])
+        for i in top_k_indices(np.maximum(conflict, isolation), 5)
+    ]
     
+    # Row form only at the boundary, for state and the LLM-facing summaries
     return {
         'herd_metrics': herd_metrics,
-        'per_cow_metrics': per_cow_metrics,
+        'per_cow_metrics': per_cow_metrics.to_dict(),
         'risk_scores': risk_scores,
         'top_risk_cows': [{'cow_id': cow_id, **scores} for cow_id, scores in top_risks]
     }
-
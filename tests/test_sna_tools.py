@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import sna_tools
+from tools.sna_tools import (
+    build_social_network_graph,
+    compute_per_cow_sna_metrics,
+    compute_risk_arrays,
+)
+
+INTERACTIONS_CSV = os.path.join(
+    os.path.dirname(__file__), "..", "src", "data", "interactions.csv"
+)
+
+
+@pytest.fixture(scope="module")
+def bundled_graph():
+    interactions = pd.read_csv(INTERACTIONS_CSV, usecols=["cow_i", "cow_j"])
+    counts = interactions.groupby(["cow_i", "cow_j"]).size().reset_index(name="count")
+    return build_social_network_graph(counts)
+
+
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_bundled_herd_is_not_scored_isolated(bundled_graph, monkeypatch, use_numba):
+    if use_numba and not sna_tools._HAS_NUMBA:
+        pytest.skip("numba not installed")
+    monkeypatch.setattr(sna_tools, "_HAS_NUMBA", use_numba)
+
+    per_cow = compute_per_cow_sna_metrics(bundled_graph)
+    _, isolation = compute_risk_arrays(per_cow)
+
+    # The bundled herd is a complete graph: every cow is maximally connected
+    n = bundled_graph.number_of_nodes()
+    assert bundled_graph.number_of_edges() == n * (n - 1) // 2
+    np.testing.assert_allclose(isolation, 0.0, atol=1e-12)
+
+
+def test_empty_interactions_give_empty_graph():
+    empty = pd.DataFrame({"cow_i": [], "cow_j": [], "count": []})
+    assert sna_tools.create_social_network_graph(empty) == {}